@@ -16,6 +16,7 @@ from components.form_sections import (
 )
 from components.ai_generator import AIGenerator, render_ai_buttons, handle_ai_generation, handle_ai_generation_pre_render
 from components.preview import render_resume_preview, render_empty_preview
+from utils.helpers import split_skills_string
 from components.pdf_exporter import create_download_button, create_cover_letter_download_button
 from components.cover_letter_form import (
     render_cover_letter_personal_info,
@@ -226,13 +227,31 @@ def render_home_page():
         st.session_state.page = "Build Resume"
         st.rerun()
 
+def get_skills_list(skills_string):
+    """
+    Split a comma-separated skills string, reusing the result across reruns
+    
+    Args:
+        skills_string (str): Raw skills field value
+        
+    Returns:
+        list: Individual skills
+    """
+    skills_cache = st.session_state.setdefault('_skills_cache', {})
+    if skills_string not in skills_cache:
+        # Only the latest few values are ever looked up again
+        if len(skills_cache) >= 32:
+            skills_cache.clear()
+        skills_cache[skills_string] = split_skills_string(skills_string)
+    return skills_cache[skills_string]
+
 def render_builder_page():
     """Render resume builder page"""
     
     # Get cached AI Generator instance
     ai_generator = get_ai_generator()
     
-    # Handle resume loading BEFORE rendering widgets
+    # Confirm a resume loaded by the Load button on this run
     handle_resume_load_pre_render()
     
     # Handle any pending AI generation BEFORE rendering widgets
@@ -323,17 +342,25 @@ def render_builder_page():
         # Handle AI generation
         handle_ai_generation(ai_buttons, ai_generator, resume_data)
         
+        # Split skills once and share the lists with the PDF and the preview,
+        # on a copy so the saved resume never holds them
+        render_data = {
+            **resume_data,
+            '_technical_skills_list': get_skills_list(resume_data.get('technical_skills', '')),
+            '_soft_skills_list': get_skills_list(resume_data.get('soft_skills', '')),
+        }
+        
         st.markdown("---")
         
         # Download PDF Button
         st.markdown("### Download Your Resume")
         
         if st.button("Generate & Download PDF", use_container_width=True, type="primary"):
-            if not resume_data.get('name') or not resume_data.get('email'):
+            if not render_data.get('name') or not render_data.get('email'):
                 st.error("Please fill in at least Name and Email to generate PDF")
             else:
                 with st.spinner("Generating PDF..."):
-                    pdf_bytes, filename = create_download_button(resume_data)
+                    pdf_bytes, filename = create_download_button(render_data)
                     
                     if pdf_bytes:
                         st.download_button(
@@ -349,8 +376,8 @@ def render_builder_page():
         st.markdown("### Live Preview")
         
         # Show preview if there's data
-        if resume_data.get('name'):
-            render_resume_preview(resume_data)
+        if render_data.get('name'):
+            render_resume_preview(render_data)
         else:
             render_empty_preview()
 
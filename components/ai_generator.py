@@ -4,27 +4,86 @@ Handles all AI-powered content generation
 """
 
 import streamlit as st
-from utils.ai_client import AIClient
+from utils.ai_client import get_ai_client
 from utils.prompts import (
     get_summary_prompt, get_experience_prompt, 
     get_project_prompt, get_skills_suggestion_prompt
 )
 from utils.helpers import clean_bullet_points
 
+# Prefixes of the validation and provider error messages returned instead of content
+_NOT_CONTENT_PREFIXES = ("Please", "Rate", "Invalid")
+
+def _build_summary_prompt(name, target_role, experience_years, key_skills, education):
+    """Build the professional summary prompt from the first education entry"""
+    # Prepare education string and status
+    if isinstance(education, list) and education:
+        edu_str = f"{education[0]['degree']} in {education[0]['field']}"
+        edu_status = education[0].get('status', 'Completed')
+    else:
+        edu_str = "Bachelor's Degree"
+        edu_status = "Completed"
+    
+    return get_summary_prompt(name, target_role, experience_years, 
+                              key_skills, edu_str, edu_status)
+
+def _experience_prompts(experience_list):
+    """(index, prompt) for every experience entry that has responsibilities"""
+    return [
+        (i, get_experience_prompt(
+            exp['job_title'],
+            exp['company'],
+            f"{exp.get('start_date', '')} - {exp.get('end_date', '')}",
+            exp['responsibilities']
+        ))
+        for i, exp in enumerate(experience_list)
+        if exp.get('responsibilities', '')
+    ]
+
+def _project_prompts(projects_list):
+    """(index, prompt) for every project with a usable description"""
+    return [
+        (i, get_project_prompt(
+            proj['title'],
+            proj.get('duration', ''),
+            proj.get('technologies', ''),
+            proj['description']
+        ))
+        for i, proj in enumerate(projects_list)
+        if len(proj.get('description') or '') > 10
+    ]
+
+def _use_ai_cache():
+    """Whether AI actions may reuse cached responses, i.e. Regenerate is not ticked"""
+    return not st.session_state.get('ai_regenerate', False)
+
+def _to_bullets(result):
+    """Clean and format bullet points, keeping the raw text if none were found"""
+    bullets = clean_bullet_points(result)
+    return bullets if bullets else [result]
+
+def _parse_skills(result):
+    """Parse a comma-separated skills response, ignoring error messages"""
+    if result and not result.startswith(_NOT_CONTENT_PREFIXES):
+        skills = [s.strip() for s in result.split(',')]
+        return [s for s in skills if s]  # Remove empty strings
+    
+    return []
+
 class AIGenerator:
     """Class to handle AI content generation"""
     
     def __init__(self):
         """Initialize AI generator with AI client"""
         try:
-            self.client = AIClient()
+            self.client = get_ai_client()
             self.is_available = True
         except Exception as e:
             st.error(f"Failed to initialize AI: {str(e)}")
             self.is_available = False
     
     def generate_professional_summary(self, name, target_role, experience_years, 
-                                     key_skills, education):
+                                     key_skills, education, use_cache=True):
         """
         Generate professional summary using AI
         
@@ -34,6 +93,7 @@ class AIGenerator:
             experience_years (int): Years of experience
             key_skills (str): Key skills
             education (str): Education background
+            use_cache (bool): Whether to reuse a cached response for the same inputs
             
         Returns:
             str: Generated professional summary
@@ -44,23 +104,14 @@ class AIGenerator:
         if not target_role:
             return "Please enter a target job role first."
         
-        # Prepare education string and status
-        if isinstance(education, list) and education:
-            edu_str = f"{education[0]['degree']} in {education[0]['field']}"
-            edu_status = education[0].get('status', 'Completed')
-        else:
-            edu_str = "Bachelor's Degree"
-            edu_status = "Completed"
-        
-        prompt = get_summary_prompt(name, target_role, experience_years, 
-                                   key_skills, edu_str, edu_status)
+        prompt = _build_summary_prompt(name, target_role, experience_years, key_skills, education)
         
         with st.spinner("🤖 Generating professional summary..."):
-            result = self.client.generate_content(prompt)
+            result = self.client.generate_content(prompt, use_cache=use_cache)
         
         return result
     
-    def generate_experience_bullets(self, job_title, company, duration, responsibilities):
+    def generate_experience_bullets(self, job_title, company, duration, responsibilities, use_cache=True):
         """
         Generate experience bullet points using AI
         
@@ -69,6 +120,7 @@ class AIGenerator:
             company (str): Company name
             duration (str): Employment duration
             responsibilities (str): Basic responsibilities
+            use_cache (bool): Whether to reuse a cached response for the same inputs
             
         Returns:
             list: Generated bullet points
@@ -82,13 +134,11 @@ class AIGenerator:
         prompt = get_experience_prompt(job_title, company, duration, responsibilities)
         
         with st.spinner("🤖 Generating professional bullet points..."):
-            result = self.client.generate_content(prompt)
+            result = self.client.generate_content(prompt, use_cache=use_cache)
         
-        # Clean and format bullet points
-        bullets = clean_bullet_points(result)
-        return bullets if bullets else [result]
+        return _to_bullets(result)
     
-    def enhance_project_description(self, project_title, duration, technologies, description):
+    def enhance_project_description(self, project_title, duration, technologies, description, use_cache=True):
         """
         Enhance project description using AI with STAR methodology bullet points
         
@@ -97,6 +147,7 @@ class AIGenerator:
             duration (str): Project duration
             technologies (str): Technologies used
             description (str): Basic description
+            use_cache (bool): Whether to reuse a cached response for the same inputs
             
         Returns:
             list: Enhanced project description as bullet points
@@ -110,19 +161,54 @@ class AIGenerator:
         prompt = get_project_prompt(project_title, duration, technologies, description)
         
         with st.spinner("🤖 Enhancing project description with STAR methodology..."):
-            result = self.client.generate_content(prompt)
+            result = self.client.generate_content(prompt, use_cache=use_cache)
+        
+        return _to_bullets(result)
+    
+    def enhance_all_experiences(self, experience_list, use_cache=True):
+        """
+        Generate bullet points for every experience entry, sending the requests concurrently
+        
+        Args:
+            experience_list (list): Experience entries
+            use_cache (bool): Whether to reuse cached responses for unchanged entries
+            
+        Returns:
+            dict: Bullet points keyed by the index of each entry that had responsibilities
+        """
+        if not self.is_available:
+            return {}
+        
+        jobs = _experience_prompts(experience_list)
+        results = self.client.generate_batch([prompt for _, prompt in jobs], use_cache=use_cache)
+        return {i: _to_bullets(result) for (i, _), result in zip(jobs, results)}
+    
+    def enhance_all_projects(self, projects_list, use_cache=True):
+        """
+        Generate STAR bullet points for every project, sending the requests concurrently
+        
+        Args:
+            projects_list (list): Project entries
+            use_cache (bool): Whether to reuse cached responses for unchanged entries
+            
+        Returns:
+            dict: Bullet points keyed by the index of each project that had a description
+        """
+        if not self.is_available:
+            return {}
         
-        # Clean and format bullet points
-        bullets = clean_bullet_points(result)
-        return bullets if bullets else [result]
+        jobs = _project_prompts(projects_list)
+        results = self.client.generate_batch([prompt for _, prompt in jobs], use_cache=use_cache)
+        return {i: _to_bullets(result) for (i, _), result in zip(jobs, results)}
     
-    def suggest_skills(self, target_role, current_skills):
+    def suggest_skills(self, target_role, current_skills, use_cache=True):
         """
         Suggest additional skills using AI
         
         Args:
             target_role (str): Target job role
             current_skills (str): Current skills (comma-separated)
+            use_cache (bool): Whether to reuse a cached response for the same inputs
             
         Returns:
             list: Suggested skills
@@ -136,21 +222,17 @@ class AIGenerator:
         prompt = get_skills_suggestion_prompt(target_role, current_skills)
         
         with st.spinner("🤖 Suggesting relevant skills..."):
-            result = self.client.generate_content(prompt)
+            result = self.client.generate_content(prompt, use_cache=use_cache)
         
-        # Parse comma-separated skills
-        if result and not result.startswith("Please") and not result.startswith("Rate") and not result.startswith("Invalid"):
-            skills = [s.strip() for s in result.split(',')]
-            return [s for s in skills if s]  # Remove empty strings
-        
-        return []
+        return _parse_skills(result)
     
-    def optimize_entire_resume(self, resume_data):
+    def optimize_entire_resume(self, resume_data, use_cache=True):
         """
         Comprehensive AI optimization of entire resume for target role
         
         Args:
             resume_data (dict): Complete resume data
+            use_cache (bool): Whether to reuse cached responses for unchanged sections
             
         Returns:
             dict: Optimized resume data with AI enhancements
@@ -163,82 +245,81 @@ class AIGenerator:
             return None
         
         optimizations = {}
+        experience_list = resume_data.get('experience_list') or []
+        projects_list = resume_data.get('projects_list') or []
+        
+        # Build every independent prompt up front so they can be sent concurrently.
+        # Each job is (kind, list index or None, prompt).
+        jobs = []
+        
+        # 1. Generate/Enhance Summary
+        if not resume_data.get('summary') or len(resume_data.get('summary', '')) < 50:
+            jobs.append(('summary', None, _build_summary_prompt(
+                name=resume_data.get('name', 'Candidate'),
+                target_role=target_role,
+                experience_years=resume_data.get('experience_years', 0),
+                key_skills=resume_data.get('technical_skills', ''),
+                education=resume_data.get('education_list', [])
+            )))
+        
+        # 2. Enhance ALL Experiences
+        jobs.extend(('experience', i, prompt) for i, prompt in _experience_prompts(experience_list))
+        
+        # 3. Enhance ALL Projects
+        jobs.extend(('project', i, prompt) for i, prompt in _project_prompts(projects_list))
+        
+        # 4. Suggest Additional Skills
+        jobs.append(('skills', None, get_skills_suggestion_prompt(
+            target_role, resume_data.get('technical_skills', '')
+        )))
         
         with st.spinner("AI is analyzing and optimizing your resume..."):
-            # 1. Generate/Enhance Summary
-            if not resume_data.get('summary') or len(resume_data.get('summary', '')) < 50:
-                summary = self.generate_professional_summary(
-                    name=resume_data.get('name', 'Candidate'),
-                    target_role=target_role,
-                    experience_years=resume_data.get('experience_years', 0),
-                    key_skills=resume_data.get('technical_skills', ''),
-                    education=resume_data.get('education_list', [])
-                )
-                if summary and not summary.startswith("Please"):
-                    optimizations['summary'] = summary
+            results = self.client.generate_batch([prompt for _, _, prompt in jobs], use_cache=use_cache)
+        
+        enhanced_experiences = list(experience_list)
+        enhanced_projects = list(projects_list)
+        suggested = []
+        
+        for (kind, index, _), result in zip(jobs, results):
+            if kind == 'summary':
+                if result and not result.startswith("Please"):
+                    optimizations['summary'] = result
             
-            # 2. Enhance ALL Experiences
-            if resume_data.get('experience_list'):
-                enhanced_experiences = []
-                for exp in resume_data['experience_list']:
-                    responsibilities = exp.get('responsibilities', '')
-                    if responsibilities:
-                        bullets = self.generate_experience_bullets(
-                            job_title=exp['job_title'],
-                            company=exp['company'],
-                            duration=f"{exp.get('start_date', '')} - {exp.get('end_date', '')}",
-                            responsibilities=responsibilities
-                        )
-                        if bullets and not bullets[0].startswith("Please"):
-                            exp_copy = exp.copy()
-                            exp_copy['bullet_points'] = bullets
-                            enhanced_experiences.append(exp_copy)
-                        else:
-                            enhanced_experiences.append(exp)
-                    else:
-                        enhanced_experiences.append(exp)
-                
-                if enhanced_experiences:
-                    optimizations['experience_list'] = enhanced_experiences
+            elif kind == 'experience':
+                bullets = _to_bullets(result)
+                if bullets and not bullets[0].startswith("Please"):
+                    exp_copy = experience_list[index].copy()
+                    exp_copy['bullet_points'] = bullets
+                    enhanced_experiences[index] = exp_copy
             
-            # 3. Enhance ALL Projects
-            if resume_data.get('projects_list'):
-                enhanced_projects = []
-                for proj in resume_data['projects_list']:
-                    description = proj.get('description', '')
-                    if description and len(description) > 10:
-                        enhanced_bullets = self.enhance_project_description(
-                            project_title=proj['title'],
-                            duration=proj.get('duration', ''),
-                            technologies=proj.get('technologies', ''),
-                            description=description
-                        )
-                        if enhanced_bullets and not enhanced_bullets[0].startswith("Please"):
-                            proj_copy = proj.copy()
-                            proj_copy['bullet_points'] = enhanced_bullets
-                            enhanced_projects.append(proj_copy)
-                        else:
-                            enhanced_projects.append(proj)
-                    else:
-                        enhanced_projects.append(proj)
-                
-                if enhanced_projects:
-                    optimizations['projects_list'] = enhanced_projects
+            elif kind == 'project':
+                enhanced_bullets = _to_bullets(result)
+                if enhanced_bullets and not enhanced_bullets[0].startswith("Please"):
+                    proj_copy = projects_list[index].copy()
+                    proj_copy['bullet_points'] = enhanced_bullets
+                    enhanced_projects[index] = proj_copy
             
-            # 4. Suggest Additional Skills
-            current_skills = resume_data.get('technical_skills', '')
-            suggested = self.suggest_skills(target_role, current_skills)
-            if suggested:
-                optimizations['suggested_skills'] = suggested
+            elif kind == 'skills':
+                suggested = _parse_skills(result)
+        
+        if enhanced_experiences:
+            optimizations['experience_list'] = enhanced_experiences
+        
+        if enhanced_projects:
+            optimizations['projects_list'] = enhanced_projects
+        
+        if suggested:
+            optimizations['suggested_skills'] = suggested
         
         return optimizations
     
-    def analyze_resume_quality(self, resume_data):
+    def analyze_resume_quality(self, resume_data, use_cache=True):
         """
         Analyze resume and provide feedback
         
         Args:
             resume_data (dict): Resume data
+            use_cache (bool): Whether to reuse a cached response for the same inputs
             
         Returns:
             str: Analysis and suggestions
@@ -267,7 +348,7 @@ class AIGenerator:
         """
         
         with st.spinner("AI is analyzing your resume..."):
-            result = self.client.generate_content(prompt)
+            result = self.client.generate_content(prompt, use_cache=use_cache)
         
         return result
 
@@ -321,6 +402,11 @@ def render_ai_buttons():
                                   key="btn_analyze",
                                   help="Get AI feedback and improvement suggestions")
     
+    # Unchanged inputs reuse the previous AI result unless this is ticked
+    st.checkbox("🔄 Regenerate (new AI drafts for unchanged inputs)",
+                key="ai_regenerate",
+                help="Ask the AI again instead of reusing the previous result")
+    
     return {
         'optimize_all': optimize_all,
         'generate_summary': generate_summary,
@@ -355,10 +441,11 @@ def handle_ai_generation_pre_render(ai_generator):
                 target_role=resume_data['target_role'],
                 experience_years=resume_data.get('experience_years', 0),
                 key_skills=all_skills if all_skills else 'Various technical skills',
-                education=resume_data.get('education_list', [])
+                education=resume_data.get('education_list', []),
+                use_cache=_use_ai_cache()
             )
             
-            if summary and not summary.startswith("Please") and not summary.startswith("Rate") and not summary.startswith("Invalid"):
+            if summary and not summary.startswith(_NOT_CONTENT_PREFIXES):
                 st.session_state['summary'] = summary
                 st.success("Professional summary generated!")
             else:
@@ -385,7 +472,7 @@ def handle_ai_generation_pre_render(ai_generator):
         
         if resume_data.get('target_role'):
             with st.spinner("AI is optimizing your entire resume... This may take a moment."):
-                optimizations = ai_generator.optimize_entire_resume(resume_data)
+                optimizations = ai_generator.optimize_entire_resume(resume_data, use_cache=_use_ai_cache())
                 
                 if optimizations:
                     # Apply all optimizations
@@ -442,21 +529,14 @@ def handle_ai_generation(ai_buttons, ai_generator, resume_data):
             enhanced_count = 0
             
             with st.spinner("Enhancing all work experiences with AI..."):
-                for idx, exp in enumerate(st.session_state.experience_list):
-                    responsibilities = exp.get('responsibilities', '')
-                    
-                    # Generate bullets for ALL experiences that have responsibilities
-                    if responsibilities:
-                        bullets = ai_generator.generate_experience_bullets(
-                            job_title=exp['job_title'],
-                            company=exp['company'],
-                            duration=f"{exp.get('start_date', '')} - {exp.get('end_date', '')}",
-                            responsibilities=responsibilities
-                        )
-                        
-                        if bullets and not bullets[0].startswith("Please") and not bullets[0].startswith("Rate") and not bullets[0].startswith("Invalid"):
-                            st.session_state.experience_list[idx]['bullet_points'] = bullets
-                            enhanced_count += 1
+                # Generate bullets for ALL experiences that have responsibilities
+                all_bullets = ai_generator.enhance_all_experiences(
+                    st.session_state.experience_list, use_cache=_use_ai_cache()
+                )
+                for idx, bullets in all_bullets.items():
+                    if bullets and not bullets[0].startswith(_NOT_CONTENT_PREFIXES):
+                        st.session_state.experience_list[idx]['bullet_points'] = bullets
+                        enhanced_count += 1
             
             if enhanced_count > 0:
                 st.success(f"Enhanced {enhanced_count} experience entries with professional bullet points!")
@@ -473,20 +553,13 @@ def handle_ai_generation(ai_buttons, ai_generator, resume_data):
             enhanced_count = 0
             
             with st.spinner("Enhancing all project descriptions with STAR methodology..."):
-                for idx, proj in enumerate(st.session_state.projects_list):
-                    description = proj.get('description', '')
-                    
-                    if description and len(description) > 10:
-                        enhanced_bullets = ai_generator.enhance_project_description(
-                            project_title=proj['title'],
-                            duration=proj.get('duration', ''),
-                            technologies=proj.get('technologies', ''),
-                            description=description
-                        )
-                        
-                        if enhanced_bullets and not enhanced_bullets[0].startswith("Please"):
-                            st.session_state.projects_list[idx]['bullet_points'] = enhanced_bullets
-                            enhanced_count += 1
+                all_bullets = ai_generator.enhance_all_projects(
+                    st.session_state.projects_list, use_cache=_use_ai_cache()
+                )
+                for idx, enhanced_bullets in all_bullets.items():
+                    if enhanced_bullets and not enhanced_bullets[0].startswith("Please"):
+                        st.session_state.projects_list[idx]['bullet_points'] = enhanced_bullets
+                        enhanced_count += 1
             
             if enhanced_count > 0:
                 st.success(f"Enhanced {enhanced_count} projects with STAR methodology bullet points!")
@@ -505,7 +578,8 @@ def handle_ai_generation(ai_buttons, ai_generator, resume_data):
             with st.spinner("AI is suggesting relevant skills..."):
                 suggested = ai_generator.suggest_skills(
                     target_role=resume_data['target_role'],
-                    current_skills=current_skills
+                    current_skills=current_skills,
+                    use_cache=_use_ai_cache()
                 )
             
             if suggested:
@@ -532,7 +606,7 @@ def handle_ai_generation(ai_buttons, ai_generator, resume_data):
             return
         
         with st.spinner("AI is analyzing your resume quality..."):
-            analysis = ai_generator.analyze_resume_quality(resume_data)
+            analysis = ai_generator.analyze_resume_quality(resume_data, use_cache=_use_ai_cache())
         
         if analysis:
             st.markdown("### Resume Analysis Report")
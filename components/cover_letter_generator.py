@@ -4,20 +4,28 @@ Handles AI-powered cover letter generation using Google Gemini
 """
 
 import streamlit as st
-from utils.ai_client import AIClient
+from utils.ai_client import get_ai_client
 from utils.prompts import get_cover_letter_prompt
+from utils.helpers import strip_markdown
 import re
 
+# Runs of consecutive blank lines
+_EXTRA_BLANK_LINES = re.compile(r'\n\n+')
+
+# Prefixes of the error messages the AI client returns instead of content
+_ERROR_PREFIXES = ("Rate limit", "Invalid", "An error")
+
 
 class CoverLetterGenerator:
     """Handles cover letter generation using AI (Gemini or OpenRouter)"""
     
     def __init__(self):
         """Initialize the cover letter generator"""
-        self.client = AIClient()
+        self.client = get_ai_client()
     
     def generate_cover_letter(self, name, email, phone, job_title, company="", 
-                             job_description="", skills="", summary="", additional_notes="", education_status="Completed"):
+                             job_description="", skills="", summary="", additional_notes="", education_status="Completed",
+                             use_cache=True):
         """
         Generate a professional cover letter using AI
         
@@ -32,6 +40,7 @@ class CoverLetterGenerator:
             summary (str): Professional summary from resume
             additional_notes (str): Any additional context
             education_status (str): Education status - "Completed" or "Pursuing"
+            use_cache (bool): Reuse a cached response for identical inputs
             
         Returns:
             dict: Result with 'success' boolean and 'content' or 'error' message
@@ -59,10 +68,10 @@ class CoverLetterGenerator:
             )
             
             # Call Gemini API
-            response = self.client.generate_content(prompt)
+            response = self.client.generate_content(prompt, use_cache=use_cache)
             
             # Check if response is an error message
-            if response.startswith("Rate limit") or response.startswith("Invalid") or response.startswith("An error"):
+            if response.startswith(_ERROR_PREFIXES):
                 return {
                     'success': False,
                     'error': response
@@ -95,18 +104,14 @@ class CoverLetterGenerator:
         if not text:
             return ""
         
-        # Remove markdown formatting
-        # Remove bold/italic markers
-        text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)  # **bold**
-        text = re.sub(r'\*([^*]+)\*', r'\1', text)      # *italic*
-        text = re.sub(r'__([^_]+)__', r'\1', text)      # __bold__
-        text = re.sub(r'_([^_]+)_', r'\1', text)        # _italic_
+        # Remove markdown bold/italic markers
+        text = strip_markdown(text)
         
         # Remove any remaining asterisks or underscores that might be markdown
         text = text.replace('**', '').replace('__', '')
         
         # Clean up extra whitespace
-        text = re.sub(r'\n\n+', '\n\n', text)  # Multiple newlines to double
+        text = _EXTRA_BLANK_LINES.sub('\n\n', text)  # Multiple newlines to double
         text = text.strip()
         
         return text
@@ -130,6 +135,8 @@ def render_cover_letter_generator():
         if st.session_state.get('cover_letter_content'):
             if st.button("Regenerate", use_container_width=True):
                 st.session_state['_generate_cover_letter_pending'] = True
+                # Ask for a fresh letter rather than the cached one
+                st.session_state['_regenerate_cover_letter'] = True
                 st.rerun()
 
 
@@ -140,8 +147,9 @@ def handle_cover_letter_generation_pre_render():
     Must be called at the top of the page render function
     """
     if st.session_state.get('_generate_cover_letter_pending'):
-        # Clear the flag
+        # Clear the flags
         st.session_state['_generate_cover_letter_pending'] = False
+        regenerate = st.session_state.pop('_regenerate_cover_letter', False)
         
         # Get data from session state
         name = st.session_state.get('name', '')
@@ -205,7 +213,8 @@ def handle_cover_letter_generation_pre_render():
                 skills=skills,
                 summary=summary,
                 additional_notes=additional_notes,
-                education_status=education_status
+                education_status=education_status,
+                use_cache=not regenerate
             )
         
         if result['success']:
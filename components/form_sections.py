@@ -3,11 +3,150 @@ Form sections for user input in SmartResume AI
 """
 
 import streamlit as st
+from functools import lru_cache
 from utils.validators import (
     validate_email, validate_phone, validate_url, 
     validate_linkedin, validate_year, validate_cgpa, validate_percentage
 )
 
+# Widget keys of the "Add Work Experience" form, cleared after each add
+_EXP_KEYS = (
+    "new_company", "new_job_title", "new_start_date", "new_location_exp",
+    "new_is_current", "new_end_date", "new_responsibilities"
+)
+
+# Summary lines are memoized on the fields they show, so they are not rebuilt
+# on every rerun and never go stale when an entry is edited or imported.
+# The cache lives here rather than in the entries, which are resume data.
+@lru_cache(maxsize=256)
+def _education_line(degree, field, institution, year, grade):
+    """Education summary line from its fields"""
+    return f"**{degree} in {field}** - {institution} ({year}) - {grade}"
+
+@lru_cache(maxsize=256)
+def _experience_line(job_title, company, start_date, end_date):
+    """Work experience summary line from its fields"""
+    return f"**{job_title}** at {company} ({start_date} - {end_date})"
+
+@lru_cache(maxsize=256)
+def _project_line(title, duration):
+    """Project summary line from its fields"""
+    return f"**{title}** ({duration})"
+
+def _education_display(edu):
+    """Markdown summary line for an education entry"""
+    return _education_line(edu['degree'], edu['field'], edu['institution'], edu['year'], edu['grade'])
+
+def _experience_display(exp):
+    """Markdown summary line for a work experience entry"""
+    return _experience_line(exp['job_title'], exp['company'], exp['start_date'], exp['end_date'])
+
+def _project_display(proj):
+    """Markdown summary line for a project entry"""
+    return _project_line(proj['title'], proj['duration'])
+
+# Button callbacks: they run before Streamlit's implicit rerun, so the
+# updated lists render on that rerun without an extra st.rerun()
+
+def _set_form_message(form, kind, text):
+    """
+    Queue a message from an Add button callback for its form
+    
+    Callbacks run before the script, so anything they render ends up at the
+    top of the page; the form shows the message beside itself on the rerun.
+    
+    Args:
+        form (str): Form name, e.g. 'education'
+        kind (str): 'error' or 'success'
+        text (str): Message to show
+    """
+    st.session_state[f'_form_message_{form}'] = (kind, text)
+
+def _show_form_message(form):
+    """Render and clear the message queued for a form, if any"""
+    message = st.session_state.pop(f'_form_message_{form}', None)
+    if message:
+        kind, text = message
+        if kind == 'error':
+            st.error(text)
+        else:
+            st.success(text)
+
+def _add_education_cb():
+    """Append the Add Education form values to education_list"""
+    ss = st.session_state
+    institution = ss.get('new_institution', '')
+    field = ss.get('new_field', '')
+    if not (institution and field):
+        _set_form_message('education', 'error', "Please fill in institution and field of study")
+        return
+    
+    grade = ss.get('new_grade', 0.0)
+    grade_type = ss.get('new_grade_type', 'CGPA')
+    entry = {
+        'degree': ss.get('new_degree', ''),
+        'field': field,
+        'institution': institution,
+        'year': ss.get('new_year', 2024),
+        'grade': f"{grade}/10.0" if grade_type == "CGPA" else f"{grade}%",
+        'grade_type': grade_type,
+        'status': ss.get('new_status', 'Completed')
+    }
+    ss.education_list.append(entry)
+    _set_form_message('education', 'success', "Education added!")
+
+def _add_experience_cb():
+    """Append the Add Work Experience form values to experience_list"""
+    ss = st.session_state
+    company = ss.get('new_company', '')
+    job_title = ss.get('new_job_title', '')
+    start_date = ss.get('new_start_date', '')
+    responsibilities = ss.get('new_responsibilities', '')
+    if not (company and job_title and start_date and responsibilities):
+        _set_form_message('experience', 'error', "Please fill in all required fields")
+        return
+    
+    is_current = ss.get('new_is_current', False)
+    entry = {
+        'company': company,
+        'job_title': job_title,
+        'location': ss.get('new_location_exp', ''),
+        'start_date': start_date,
+        'end_date': "Present" if is_current else ss.get('new_end_date', ''),
+        'is_current': is_current,
+        'responsibilities': responsibilities,
+        'bullet_points': []  # Will be filled by AI or manual entry
+    }
+    ss.experience_list.append(entry)
+    # Reset the form fields for the next entry
+    for k in _EXP_KEYS:
+        ss.pop(k, None)
+    _set_form_message('experience', 'success', "Experience added!")
+
+def _add_project_cb():
+    """Append the Add Project form values to projects_list"""
+    ss = st.session_state
+    project_title = ss.get('new_project_title', '')
+    description = ss.get('new_description', '')
+    if not (project_title and description):
+        _set_form_message('project', 'error', "Please fill in project title and description")
+        return
+    
+    entry = {
+        'title': project_title,
+        'duration': ss.get('new_duration', ''),
+        'technologies': ss.get('new_technologies', ''),
+        'url': ss.get('new_project_url', ''),
+        'description': description,
+        'bullet_points': []  # Will be filled by AI enhancement
+    }
+    ss.projects_list.append(entry)
+    _set_form_message('project', 'success', "Project added!")
+
+def _delete_entry_cb(list_key, idx):
+    """Remove entry idx from the session-state list stored under list_key"""
+    st.session_state[list_key].pop(idx)
+
 def render_personal_info_form():
     """Render personal information form section"""
     st.subheader("Personal Information")
@@ -63,14 +202,17 @@ def render_personal_info_form():
         for error in errors:
             st.error(f"{error}")
     
-    return {
-        'name': name,
-        'email': email,
-        'phone': phone,
-        'linkedin': linkedin,
-        'location': location,
-        'portfolio': portfolio
-    }
+    # Reuse the same dict across reruns instead of building a new one
+    personal_info = st.session_state.setdefault('personal_info', {})
+    personal_info.update(
+        name=name,
+        email=email,
+        phone=phone,
+        linkedin=linkedin,
+        location=location,
+        portfolio=portfolio
+    )
+    return personal_info
 
 def render_professional_summary_form():
     """Render professional summary form section"""
@@ -97,11 +239,13 @@ def render_professional_summary_form():
                           height=120,
                           key="summary")
     
-    return {
-        'target_role': target_role,
-        'experience_years': experience_years,
-        'summary': summary
-    }
+    summary_info = st.session_state.setdefault('summary_info', {})
+    summary_info.update(
+        target_role=target_role,
+        experience_years=experience_years,
+        summary=summary
+    )
+    return summary_info
 
 def render_education_form():
     """Render education form section"""
@@ -116,18 +260,18 @@ def render_education_form():
         col1, col2 = st.columns(2)
         
         with col1:
-            degree = st.selectbox("Degree/Qualification", 
-                                 ["B.Tech", "M.Tech", "BCA", "MCA", "B.Sc", "M.Sc", 
-                                  "MBA", "BBA", "B.Com", "M.Com", "BA", "MA", "PhD", "Other"],
-                                 key="new_degree")
+            st.selectbox("Degree/Qualification", 
+                         ["B.Tech", "M.Tech", "BCA", "MCA", "B.Sc", "M.Sc", 
+                          "MBA", "BBA", "B.Com", "M.Com", "BA", "MA", "PhD", "Other"],
+                         key="new_degree")
             
-            institution = st.text_input("Institution Name", 
-                                       placeholder="ABC University",
-                                       key="new_institution")
+            st.text_input("Institution Name", 
+                          placeholder="ABC University",
+                          key="new_institution")
             
-            field = st.text_input("Field of Study", 
-                                 placeholder="Computer Science",
-                                 key="new_field")
+            st.text_input("Field of Study", 
+                          placeholder="Computer Science",
+                          key="new_field")
         
         with col2:
             status = st.radio("Status", ["Completed", "Pursuing"], key="new_status")
@@ -137,46 +281,31 @@ def render_education_form():
             else:
                 year_label = "Expected Graduation Year"
             
-            year = st.number_input(year_label, 
-                                  min_value=1950, 
-                                  max_value=2035,
-                                  value=2024,
-                                  key="new_year")
+            st.number_input(year_label, 
+                            min_value=1950, 
+                            max_value=2035,
+                            value=2024,
+                            key="new_year")
             
             grade_type = st.radio("Grade Type", ["CGPA", "Percentage"], key="new_grade_type")
             
             if grade_type == "CGPA":
-                grade = st.number_input("CGPA", 
-                                       min_value=0.0, 
-                                       max_value=10.0, 
-                                       step=0.1,
-                                       format="%.2f",
-                                       key="new_grade")
-                grade_display = f"{grade}/10.0"
+                st.number_input("CGPA", 
+                                min_value=0.0, 
+                                max_value=10.0, 
+                                step=0.1,
+                                format="%.2f",
+                                key="new_grade")
             else:
-                grade = st.number_input("Percentage", 
-                                       min_value=0.0, 
-                                       max_value=100.0, 
-                                       step=0.1,
-                                       format="%.2f",
-                                       key="new_grade")
-                grade_display = f"{grade}%"
+                st.number_input("Percentage", 
+                                min_value=0.0, 
+                                max_value=100.0, 
+                                step=0.1,
+                                format="%.2f",
+                                key="new_grade")
         
-        if st.button("Add Education Entry", key="add_education"):
-            if institution and field:
-                st.session_state.education_list.append({
-                    'degree': degree,
-                    'field': field,
-                    'institution': institution,
-                    'year': year,
-                    'grade': grade_display,
-                    'grade_type': grade_type,
-                    'status': status
-                })
-                st.success("Education added!")
-                st.rerun()
-            else:
-                st.error("Please fill in institution and field of study")
+        st.button("Add Education Entry", key="add_education", on_click=_add_education_cb)
+        _show_form_message('education')
     
     # Display added education
     if st.session_state.education_list:
@@ -184,11 +313,10 @@ def render_education_form():
         for idx, edu in enumerate(st.session_state.education_list):
             col1, col2 = st.columns([5, 1])
             with col1:
-                st.write(f"**{edu['degree']} in {edu['field']}** - {edu['institution']} ({edu['year']}) - {edu['grade']}")
+                st.write(_education_display(edu))
             with col2:
-                if st.button("Delete", key=f"del_edu_{idx}"):
-                    st.session_state.education_list.pop(idx)
-                    st.rerun()
+                st.button("Delete", key=f"del_edu_{idx}",
+                          on_click=_delete_entry_cb, args=('education_list', idx))
     
     return st.session_state.education_list
 
@@ -212,10 +340,12 @@ def render_skills_form():
                                   height=100,
                                   key="soft_skills")
     
-    return {
-        'technical_skills': technical_skills,
-        'soft_skills': soft_skills
-    }
+    skills_info = st.session_state.setdefault('skills_info', {})
+    skills_info.update(
+        technical_skills=technical_skills,
+        soft_skills=soft_skills
+    )
+    return skills_info
 
 def render_experience_form():
     """Render work experience form section"""
@@ -230,53 +360,37 @@ def render_experience_form():
         col1, col2 = st.columns(2)
         
         with col1:
-            company = st.text_input("Company Name", 
-                                   placeholder="ABC Technologies",
-                                   key="new_company")
+            st.text_input("Company Name", 
+                          placeholder="ABC Technologies",
+                          key="new_company")
             
-            job_title = st.text_input("Job Title", 
-                                     placeholder="Software Engineer",
-                                     key="new_job_title")
+            st.text_input("Job Title", 
+                          placeholder="Software Engineer",
+                          key="new_job_title")
             
-            start_date = st.text_input("Start Date", 
-                                      placeholder="January 2022",
-                                      key="new_start_date")
+            st.text_input("Start Date", 
+                          placeholder="January 2022",
+                          key="new_start_date")
         
         with col2:
-            location_exp = st.text_input("Location", 
-                                        placeholder="Bangalore, India",
-                                        key="new_location_exp")
+            st.text_input("Location", 
+                          placeholder="Bangalore, India",
+                          key="new_location_exp")
             
             is_current = st.checkbox("Currently working here", key="new_is_current")
             
             if not is_current:
-                end_date = st.text_input("End Date", 
-                                        placeholder="December 2023",
-                                        key="new_end_date")
-            else:
-                end_date = "Present"
+                st.text_input("End Date", 
+                              placeholder="December 2023",
+                              key="new_end_date")
         
-        responsibilities = st.text_area("Key Responsibilities", 
-                                       placeholder="Describe your main responsibilities and tasks...",
-                                       height=100,
-                                       key="new_responsibilities")
+        st.text_area("Key Responsibilities", 
+                     placeholder="Describe your main responsibilities and tasks...",
+                     height=100,
+                     key="new_responsibilities")
         
-        if st.button("Add Experience Entry", key="add_experience"):
-            if company and job_title and start_date and responsibilities:
-                st.session_state.experience_list.append({
-                    'company': company,
-                    'job_title': job_title,
-                    'location': location_exp,
-                    'start_date': start_date,
-                    'end_date': end_date,
-                    'is_current': is_current,
-                    'responsibilities': responsibilities,
-                    'bullet_points': []  # Will be filled by AI or manual entry
-                })
-                st.success("Experience added!")
-                st.rerun()
-            else:
-                st.error("Please fill in all required fields")
+        st.button("Add Experience Entry", key="add_experience", on_click=_add_experience_cb)
+        _show_form_message('experience')
     
     # Display added experiences
     if st.session_state.experience_list:
@@ -284,12 +398,10 @@ def render_experience_form():
         for idx, exp in enumerate(st.session_state.experience_list):
             col1, col2 = st.columns([5, 1])
             with col1:
-                duration = f"{exp['start_date']} - {exp['end_date']}"
-                st.write(f"**{exp['job_title']}** at {exp['company']} ({duration})")
+                st.write(_experience_display(exp))
             with col2:
-                if st.button("Delete", key=f"del_exp_{idx}"):
-                    st.session_state.experience_list.pop(idx)
-                    st.rerun()
+                st.button("Delete", key=f"del_exp_{idx}",
+                          on_click=_delete_entry_cb, args=('experience_list', idx))
     
     return st.session_state.experience_list
 
@@ -306,42 +418,30 @@ def render_projects_form():
         col1, col2 = st.columns(2)
         
         with col1:
-            project_title = st.text_input("Project Title", 
-                                         placeholder="AI Chatbot Application",
-                                         key="new_project_title")
+            st.text_input("Project Title", 
+                          placeholder="AI Chatbot Application",
+                          key="new_project_title")
             
-            duration = st.text_input("Duration", 
-                                    placeholder="Jan 2023 - Mar 2023",
-                                    key="new_duration")
+            st.text_input("Duration", 
+                          placeholder="Jan 2023 - Mar 2023",
+                          key="new_duration")
         
         with col2:
-            technologies = st.text_input("Technologies Used", 
-                                        placeholder="Python, TensorFlow, React",
-                                        key="new_technologies")
+            st.text_input("Technologies Used", 
+                          placeholder="Python, TensorFlow, React",
+                          key="new_technologies")
             
-            project_url = st.text_input("Project URL/GitHub (optional)", 
-                                       placeholder="https://github.com/username/project",
-                                       key="new_project_url")
+            st.text_input("Project URL/GitHub (optional)", 
+                          placeholder="https://github.com/username/project",
+                          key="new_project_url")
         
-        description = st.text_area("Project Description", 
-                                  placeholder="Describe what the project does, your role, and key achievements...",
-                                  height=100,
-                                  key="new_description")
+        st.text_area("Project Description", 
+                     placeholder="Describe what the project does, your role, and key achievements...",
+                     height=100,
+                     key="new_description")
         
-        if st.button("Add Project Entry", key="add_project"):
-            if project_title and description:
-                st.session_state.projects_list.append({
-                    'title': project_title,
-                    'duration': duration,
-                    'technologies': technologies,
-                    'url': project_url,
-                    'description': description,
-                    'bullet_points': []  # Will be filled by AI enhancement
-                })
-                st.success("Project added!")
-                st.rerun()
-            else:
-                st.error("Please fill in project title and description")
+        st.button("Add Project Entry", key="add_project", on_click=_add_project_cb)
+        _show_form_message('project')
     
     # Display added projects
     if st.session_state.projects_list:
@@ -349,11 +449,10 @@ def render_projects_form():
         for idx, proj in enumerate(st.session_state.projects_list):
             col1, col2 = st.columns([5, 1])
             with col1:
-                st.write(f"**{proj['title']}** ({proj['duration']})")
+                st.write(_project_display(proj))
             with col2:
-                if st.button("Delete", key=f"del_proj_{idx}"):
-                    st.session_state.projects_list.pop(idx)
-                    st.rerun()
+                st.button("Delete", key=f"del_proj_{idx}",
+                          on_click=_delete_entry_cb, args=('projects_list', idx))
     
     return st.session_state.projects_list
 
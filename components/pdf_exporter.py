@@ -3,15 +3,51 @@ PDF Exporter for SmartResume AI
 Generates ATS-friendly PDF resumes
 """
 
+import streamlit as st
+import traceback
+from datetime import datetime
+from functools import lru_cache
 from fpdf import FPDF
-from utils.helpers import split_skills_string, generate_filename
+from utils.helpers import (
+    split_skills_string, generate_filename, iter_lines, iter_sentences, strip_markdown
+)
 import unicodedata
 
+
+class _Latin1Fallback(dict):
+    """Translation table that maps any unlisted non-Latin-1 character to '?'"""
+    
+    def __missing__(self, key):
+        value = key if key < 256 else '?'
+        self[key] = value  # Remember the answer so str.translate hits the dict next time
+        return value
+
+
+# Common Unicode characters with ASCII equivalents, plus the Latin-1 fallback
+_LATIN1_TABLE = _Latin1Fallback(str.maketrans({
+    '\u2013': '-',     # en dash
+    '\u2014': '--',    # em dash
+    '\u2018': "'",     # left single quote
+    '\u2019': "'",     # right single quote
+    '\u201c': '"',     # left double quote
+    '\u201d': '"',     # right double quote
+    '\u2022': '-',     # bullet
+    '\u2026': '...',   # ellipsis
+    '\u00a0': ' ',     # non-breaking space
+    '\u2122': '(TM)',  # trademark
+    '\u00ae': '(R)',   # registered trademark
+    '\u00a9': '(c)',   # copyright
+}))
+
+@lru_cache(maxsize=4096)
 def sanitize_text(text):
     """
     Sanitize text to remove Unicode characters not supported by standard fonts
     and remove markdown formatting
     
+    Results are memoized, since the same names, titles and contact fields
+    are sanitized repeatedly across PDF generations.
+    
     Args:
         text (str): Input text
         
@@ -22,45 +58,98 @@ def sanitize_text(text):
         return ""
     
     # Remove markdown formatting
-    import re
-    # Remove bold/italic markers (**text**, *text*, __text__, _text_)
-    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)  # **bold**
-    text = re.sub(r'\*([^*]+)\*', r'\1', text)      # *italic*
-    text = re.sub(r'__([^_]+)__', r'\1', text)      # __bold__
-    text = re.sub(r'_([^_]+)_', r'\1', text)        # _italic_
-    
-    # Replace common Unicode characters with ASCII equivalents
-    replacements = {
-        '\u2013': '-',  # en dash
-        '\u2014': '--',  # em dash
-        '\u2018': "'",   # left single quote
-        '\u2019': "'",   # right single quote
-        '\u201c': '"',   # left double quote
-        '\u201d': '"',   # right double quote
-        '\u2022': '-',   # bullet
-        '\u2026': '...',  # ellipsis
-        '\u00a0': ' ',   # non-breaking space
-        '\u2122': '(TM)',  # trademark
-        '\u00ae': '(R)',   # registered trademark
-        '\u00a9': '(c)',   # copyright
-    }
-    
-    # Apply replacements
-    for unicode_char, replacement in replacements.items():
-        text = text.replace(unicode_char, replacement)
-    
-    # Remove any remaining non-Latin-1 characters
-    text = ''.join(char if ord(char) < 256 else '?' for char in text)
-    
-    return text
+    return _to_latin1(strip_markdown(text))
+
+def _to_latin1(text):
+    """Map text to Latin-1 compatible characters, leaving markdown alone"""
+    # Every character the table rewrites is non-ASCII, and isascii() is a
+    # flag check on CPython strings, so plain ASCII text is returned as is
+    if text.isascii():
+        return text
+    
+    # Replace known Unicode characters and any other non-Latin-1 ones in one pass
+    return text.translate(_LATIN1_TABLE)
+
+# Fields holding identifiers or links (snake_case skills, user names in URLs),
+# where markdown stripping would eat underscores; they are only Latin-1 mapped
+_KEEP_MARKDOWN_FIELDS = frozenset({
+    'email', 'linkedin', 'portfolio',
+    'technical_skills', 'soft_skills', '_technical_skills_list', '_soft_skills_list',
+    'technologies', 'description',
+})
+
+def _sanitize_value(value, keep_markdown=False):
+    """Recursively sanitize strings inside lists and dicts"""
+    if isinstance(value, str):
+        return _to_latin1(value) if keep_markdown else sanitize_text(value)
+    if isinstance(value, list):
+        return [_sanitize_value(v, keep_markdown) for v in value]
+    if isinstance(value, dict):
+        # URLs are emitted verbatim
+        return {
+            k: v if k == 'url' else _sanitize_value(v, k in _KEEP_MARKDOWN_FIELDS)
+            for k, v in value.items()
+        }
+    return value
+
+def _sanitize_resume_data(resume_data):
+    """
+    Sanitize every text field of the resume data once, up front
+    
+    Args:
+        resume_data (dict): Resume data
+        
+    Returns:
+        dict: Sanitized copy of the resume data, plus the derived header
+            fields 'name_upper' and 'contact_line_1'
+    """
+    sanitized = _sanitize_value(resume_data)
+    # Missing fields get placeholders, None renders as "" like sanitize_text(None)
+    sanitized['name_upper'] = (sanitized.get('name', 'Your Name') or '').upper()
+    sanitized['contact_line_1'] = ' | '.join((
+        sanitized.get('email', 'email@example.com') or '',
+        sanitized.get('phone', '+91-XXXXXXXXXX') or '',
+        sanitized.get('location', 'City, Country') or ''
+    ))
+    return sanitized
+
+class _StatefulPDF(FPDF):
+    """FPDF base class that skips font and text color changes that are no-ops"""
+    
+    def __init__(self):
+        super().__init__()
+        # Arguments of the last _set_font / _set_text_color calls
+        self._current_font = None
+        self._current_text_color = None
+    
+    def _set_font(self, family, style='', size=0):
+        """Set the font, skipping the call when it is already selected"""
+        font = (family, style, size)
+        if font != self._current_font:
+            self.set_font(family, style, size)
+            self._current_font = font
+    
+    def _set_text_color(self, r, g, b):
+        """Set the text color, skipping the call when it is already selected"""
+        color = (r, g, b)
+        if color != self._current_text_color:
+            self.set_text_color(r, g, b)
+            self._current_text_color = color
 
-class ResumePDF(FPDF):
+
+class ResumePDF(_StatefulPDF):
     """Custom PDF class for resume generation"""
     
     def __init__(self):
         super().__init__()
         self.set_auto_page_break(auto=True, margin=15)
         self.set_margins(left=10, top=10, right=10)
+        # Set when the caller already ran the data through _sanitize_resume_data
+        self._sanitized = False
+    
+    def _clean(self, text):
+        """Sanitize text unless the resume data was sanitized up front"""
+        return text if self._sanitized else sanitize_text(text)
     
     def header(self):
         """Override header to prevent automatic header on new pages"""
@@ -72,32 +161,32 @@ class ResumePDF(FPDF):
         """Override footer to prevent automatic footer"""
         pass  # No footer needed
     
-    def header_section(self, name, email, phone, location, linkedin='', portfolio=''):
-        """Add header with personal information"""
+    def header_section(self, name, email, phone, location, linkedin='', portfolio='',
+                       name_upper=None, contact_line_1=None):
+        """Add header with personal information, using precomputed header strings when given"""
         # Sanitize all inputs
-        name = sanitize_text(name)
-        email = sanitize_text(email)
-        phone = sanitize_text(phone)
-        location = sanitize_text(location)
-        linkedin = sanitize_text(linkedin)
-        portfolio = sanitize_text(portfolio)
+        linkedin = self._clean(linkedin)
+        portfolio = self._clean(portfolio)
+        if name_upper is None:
+            name_upper = self._clean(name).upper()
+        if contact_line_1 is None:
+            contact_line_1 = f"{self._clean(email)} | {self._clean(phone)} | {self._clean(location)}"
         
         # Name
-        self.set_font('Arial', 'B', 20)
-        self.set_text_color(31, 119, 180)  # Blue color
-        self.cell(0, 10, name.upper(), 0, 1, 'C')
+        self._set_font('Arial', 'B', 20)
+        self._set_text_color(31, 119, 180)  # Blue color
+        self.cell(0, 10, name_upper, 0, 1, 'C')
         
         # Contact information - Line 1
-        self.set_font('Arial', '', 10)
-        self.set_text_color(0, 0, 0)
+        self._set_font('Arial', '', 10)
+        self._set_text_color(0, 0, 0)
         
-        contact_line_1 = f"{email} | {phone} | {location}"
         self.cell(0, 5, contact_line_1, 0, 1, 'C')
         
         # Contact information - Line 2 (Links)
         if linkedin or portfolio:
-            self.set_font('Arial', 'U', 10)
-            self.set_text_color(31, 119, 180)
+            self._set_font('Arial', 'U', 10)
+            self._set_text_color(31, 119, 180)
             
             links = []
             if linkedin:
@@ -112,9 +201,9 @@ class ResumePDF(FPDF):
     
     def section_title(self, title):
         """Add section title"""
-        title = sanitize_text(title)
-        self.set_font('Arial', 'B', 12)
-        self.set_text_color(31, 119, 180)
+        title = self._clean(title)
+        self._set_font('Arial', 'B', 12)
+        self._set_text_color(31, 119, 180)
         self.cell(0, 6, title.upper(), 0, 1)
         
         # Add underline
@@ -123,12 +212,12 @@ class ResumePDF(FPDF):
         self.line(10, self.get_y(), 200, self.get_y())
         self.ln(3)
         
-        self.set_text_color(0, 0, 0)
+        self._set_text_color(0, 0, 0)
     
     def add_text(self, text, font_size=11, style=''):
         """Add regular text"""
-        text = sanitize_text(text)
-        self.set_font('Arial', style, font_size)
+        text = self._clean(text)
+        self._set_font('Arial', style, font_size)
         # Ensure we're within margins
         self.set_x(self.l_margin)
         self.multi_cell(0, 5, text)
@@ -136,8 +225,8 @@ class ResumePDF(FPDF):
     
     def add_bullet_point(self, text, indent=5):
         """Add bullet point"""
-        text = sanitize_text(text)
-        self.set_font('Arial', '', 11)
+        text = self._clean(text)
+        self._set_font('Arial', '', 11)
         
         # Get margins
         left_margin = self.l_margin
@@ -162,10 +251,10 @@ class ResumePDF(FPDF):
     
     def add_subsection(self, title, meta='', indent=0):
         """Add subsection with title and metadata"""
-        title = sanitize_text(title)
-        meta = sanitize_text(meta)
+        title = self._clean(title)
+        meta = self._clean(meta)
         
-        self.set_font('Arial', 'B', 11)
+        self._set_font('Arial', 'B', 11)
         
         # Calculate available width
         available_width = self.w - self.l_margin - self.r_margin - indent
@@ -177,11 +266,11 @@ class ResumePDF(FPDF):
         self.multi_cell(available_width, 5, title)
         
         if meta:
-            self.set_font('Arial', 'I', 10)
-            self.set_text_color(100, 100, 100)
+            self._set_font('Arial', 'I', 10)
+            self._set_text_color(100, 100, 100)
             self.set_x(self.l_margin + indent)
             self.multi_cell(available_width, 5, meta)
-            self.set_text_color(0, 0, 0)
+            self._set_text_color(0, 0, 0)
         
         # Reset X position to left margin after subsection
         self.set_x(self.l_margin)
@@ -196,7 +285,11 @@ def generate_resume_pdf(resume_data):
     Returns:
         bytes: PDF file bytes
     """
+    # Sanitize all fields once so the layout helpers can skip it
+    resume_data = _sanitize_resume_data(resume_data)
+    
     pdf = ResumePDF()
+    pdf._sanitized = True
     pdf.add_page()
     
     # Header
@@ -206,7 +299,9 @@ def generate_resume_pdf(resume_data):
         phone=resume_data.get('phone', '+91-XXXXXXXXXX'),
         location=resume_data.get('location', 'City, Country'),
         linkedin=resume_data.get('linkedin', ''),
-        portfolio=resume_data.get('portfolio', '')
+        portfolio=resume_data.get('portfolio', ''),
+        name_upper=resume_data['name_upper'],
+        contact_line_1=resume_data['contact_line_1']
     )
     
     # Professional Summary
@@ -237,20 +332,24 @@ def generate_resume_pdf(resume_data):
         pdf.section_title('Skills')
         
         if tech_skills:
-            pdf.set_font('Arial', 'B', 11)
+            pdf._set_font('Arial', 'B', 11)
             pdf.cell(0, 5, 'Technical Skills:', 0, 1)
-            pdf.set_font('Arial', '', 11)
+            pdf._set_font('Arial', '', 11)
             pdf.set_x(pdf.l_margin)
-            skills_text = ' - '.join(split_skills_string(tech_skills))
+            skills_text = ' - '.join(
+                resume_data.get('_technical_skills_list') or split_skills_string(tech_skills)
+            )
             pdf.multi_cell(0, 5, skills_text)
             pdf.ln(2)
         
         if soft_skills:
-            pdf.set_font('Arial', 'B', 11)
+            pdf._set_font('Arial', 'B', 11)
             pdf.cell(0, 5, 'Soft Skills:', 0, 1)
-            pdf.set_font('Arial', '', 11)
+            pdf._set_font('Arial', '', 11)
             pdf.set_x(pdf.l_margin)
-            skills_text = ' - '.join(split_skills_string(soft_skills))
+            skills_text = ' - '.join(
+                resume_data.get('_soft_skills_list') or split_skills_string(soft_skills)
+            )
             pdf.multi_cell(0, 5, skills_text)
             pdf.ln(2)
         
@@ -277,11 +376,8 @@ def generate_resume_pdf(resume_data):
                     pdf.add_bullet_point(bullet)
             elif exp.get('responsibilities'):
                 # Split responsibilities into sentences
-                resp_lines = exp['responsibilities'].split('.')
-                for line in resp_lines:
-                    line = line.strip()
-                    if line:
-                        pdf.add_bullet_point(line + '.')
+                for line in iter_sentences(exp['responsibilities']):
+                    pdf.add_bullet_point(line + '.')
             
             pdf.ln(3)
         pdf.ln(2)
@@ -311,16 +407,16 @@ def generate_resume_pdf(resume_data):
                 # Fallback to description if no bullets
                 description = proj.get('description', '')
                 if description:
-                    pdf.set_font('Arial', '', 11)
+                    pdf._set_font('Arial', '', 11)
                     pdf.set_x(pdf.l_margin)
                     pdf.multi_cell(0, 5, description)
             
             if proj.get('url'):
-                pdf.set_font('Arial', 'I', 10)
-                pdf.set_text_color(31, 119, 180)
+                pdf._set_font('Arial', 'I', 10)
+                pdf._set_text_color(31, 119, 180)
                 pdf.set_x(pdf.l_margin)
                 pdf.multi_cell(0, 5, f"URL: {proj['url']}")
-                pdf.set_text_color(0, 0, 0)
+                pdf._set_text_color(0, 0, 0)
             
             pdf.ln(3)
         pdf.ln(2)
@@ -329,17 +425,14 @@ def generate_resume_pdf(resume_data):
     certifications = resume_data.get('certifications', '')
     if certifications:
         pdf.section_title('Certifications & Achievements')
-        cert_lines = certifications.split('\n')
-        for cert in cert_lines:
-            cert = cert.strip()
-            if cert:
-                pdf.add_bullet_point(cert)
+        for cert in iter_lines(certifications):
+            pdf.add_bullet_point(cert)
         pdf.ln(2)
     
     # Return PDF as bytes
-    pdf_output = pdf.output(dest='S')
-    # FPDF2 returns bytearray, convert to bytes if needed
-    return bytes(pdf_output) if isinstance(pdf_output, bytearray) else pdf_output
+    # output() always returns a bytearray on fpdf2 >= 2.7; st.download_button
+    # rejects bytearray, so convert once here
+    return bytes(pdf.output())
 
 def create_download_button(resume_data):
     """
@@ -351,22 +444,19 @@ def create_download_button(resume_data):
     Returns:
         tuple: (pdf_bytes, filename)
     """
-    import streamlit as st
-    
     try:
         pdf_bytes = generate_resume_pdf(resume_data)
         filename = generate_filename(resume_data.get('name', 'Resume'))
         
         return pdf_bytes, filename
     except Exception as e:
-        import traceback
         error_details = traceback.format_exc()
         st.error(f"Error generating PDF: {str(e)}")
         st.text(error_details)  # Show full traceback for debugging
         return None, None
 
 
-class CoverLetterPDF(FPDF):
+class CoverLetterPDF(_StatefulPDF):
     """Custom PDF class for cover letter generation"""
     
     def header(self):
@@ -394,8 +484,6 @@ def generate_cover_letter_pdf(name, email, phone, location, company, job_title,
     Returns:
         bytes: PDF file content
     """
-    from datetime import datetime
-    
     pdf = CoverLetterPDF()
     pdf.add_page()
     
@@ -404,10 +492,10 @@ def generate_cover_letter_pdf(name, email, phone, location, company, job_title,
     pdf.set_auto_page_break(auto=True, margin=25.4)
     
     # Header - Contact Info (right-aligned)
-    pdf.set_font('Arial', 'B', 12)
+    pdf._set_font('Arial', 'B', 12)
     pdf.cell(0, 6, sanitize_text(name), ln=True, align='R')
     
-    pdf.set_font('Arial', '', 10)
+    pdf._set_font('Arial', '', 10)
     contact_line = f"{sanitize_text(email)} | {sanitize_text(phone)}"
     if location:
         contact_line += f" | {sanitize_text(location)}"
@@ -416,7 +504,7 @@ def generate_cover_letter_pdf(name, email, phone, location, company, job_title,
     
     # Date
     today = datetime.now().strftime("%B %d, %Y")
-    pdf.set_font('Arial', '', 11)
+    pdf._set_font('Arial', '', 11)
     pdf.cell(0, 5, today, ln=True)
     pdf.ln(3)
     
@@ -427,18 +515,18 @@ def generate_cover_letter_pdf(name, email, phone, location, company, job_title,
     pdf.ln(3)
     
     # Subject Line
-    pdf.set_font('Arial', 'B', 11)
+    pdf._set_font('Arial', 'B', 11)
     subject = f"Re: Application for {sanitize_text(job_title)}"
     pdf.cell(0, 5, subject, ln=True)
     pdf.ln(3)
     
     # Salutation
-    pdf.set_font('Arial', '', 11)
+    pdf._set_font('Arial', '', 11)
     pdf.cell(0, 5, "Dear Hiring Manager,", ln=True)
     pdf.ln(3)
     
     # Cover Letter Body
-    pdf.set_font('Arial', '', 11)
+    pdf._set_font('Arial', '', 11)
     
     # Sanitize and split into paragraphs
     clean_content = sanitize_text(cover_letter_content)
@@ -454,12 +542,11 @@ def generate_cover_letter_pdf(name, email, phone, location, company, job_title,
     pdf.ln(1)
     pdf.cell(0, 5, "Sincerely,", ln=True)
     pdf.ln(2)  # Minimal spacing between "Sincerely" and name
-    pdf.set_font('Arial', 'B', 11)
+    pdf._set_font('Arial', 'B', 11)
     pdf.cell(0, 5, sanitize_text(name), ln=True)
     
     # Generate PDF output
-    pdf_output = pdf.output(dest='S')
-    return bytes(pdf_output) if isinstance(pdf_output, bytearray) else pdf_output
+    return bytes(pdf.output())
 
 
 def create_cover_letter_download_button(name, email, phone, location, company, job_title, cover_letter_content):
@@ -478,8 +565,6 @@ def create_cover_letter_download_button(name, email, phone, location, company, j
     Returns:
         tuple: (pdf_bytes, filename) or (None, None) on error
     """
-    import streamlit as st
-    
     try:
         pdf_bytes = generate_cover_letter_pdf(
             name=name,
@@ -498,9 +583,7 @@ def create_cover_letter_download_button(name, email, phone, location, company, j
         
         return pdf_bytes, filename
     except Exception as e:
-        import traceback
         error_details = traceback.format_exc()
         st.error(f"Error generating cover letter PDF: {str(e)}")
         st.text(error_details)
         return None, None
-
@@ -4,222 +4,277 @@ Renders real-time resume preview
 """
 
 import streamlit as st
-from utils.helpers import split_skills_string
+from html import escape
+from utils.helpers import split_skills_string, iter_lines, iter_sentences
 
-def render_resume_preview(resume_data):
+# Stylesheet for the preview markup, emitted with every render
+_PREVIEW_CSS = """
+<style>
+.preview-container {
+    background-color: white;
+    padding: 2rem;
+    border-radius: 8px;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+    font-family: Arial, sans-serif;
+    color: #2c3e50;
+}
+.preview-name {
+    font-size: 24px;
+    font-weight: bold;
+    color: #1f77b4;
+    text-align: center;
+    margin-bottom: 8px;
+}
+.preview-contact {
+    text-align: center;
+    font-size: 11px;
+    color: #555;
+    margin-bottom: 20px;
+}
+.preview-section-title {
+    font-size: 14px;
+    font-weight: bold;
+    color: #1f77b4;
+    border-bottom: 2px solid #1f77b4;
+    margin-top: 16px;
+    margin-bottom: 10px;
+    padding-bottom: 4px;
+}
+.preview-content {
+    font-size: 11px;
+    line-height: 1.6;
+    margin-bottom: 12px;
+}
+.preview-subtitle {
+    font-weight: bold;
+    color: #2c3e50;
+    margin-bottom: 4px;
+}
+.preview-meta {
+    font-size: 10px;
+    color: #666;
+    font-style: italic;
+}
+.preview-bullet {
+    margin-left: 20px;
+    margin-bottom: 4px;
+}
+.preview-skills {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 8px;
+}
+.preview-skill-tag {
+    background-color: #e8f4f8;
+    color: #1f77b4;
+    padding: 4px 12px;
+    border-radius: 12px;
+    font-size: 10px;
+    font-weight: 500;
+}
+</style>
+"""
+
+# Overall preview layout, each field is one pre-rendered section
+_PREVIEW_MASTER = (
+    '<div class="preview-container">'
+    '{header}{summary}{education}{skills}{experience}{projects}{certifications}'
+    '</div>'
+)
+
+# Per-entry HTML templates, filled with str.format_map from the entry dict
+_EDU_TMPL = (
+    '<div class="preview-content">'
+    '<div class="preview-subtitle">{degree} in {field}</div>'
+    '<div class="preview-meta">{institution} | {status_label}: {year} | Grade: {grade}</div>'
+    '</div>'
+)
+_EXP_HEAD_TMPL = (
+    '<div class="preview-content">'
+    '<div class="preview-subtitle">{job_title} | {company}</div>'
+    '<div class="preview-meta">{meta}</div>'
+)
+_PROJ_HEAD_TMPL = (
+    '<div class="preview-content">'
+    '<div class="preview-subtitle">{title}</div>'
+)
+
+def _escape_value(value):
+    """Recursively HTML-escape strings inside lists and dicts"""
+    if isinstance(value, str):
+        return escape(value)
+    if isinstance(value, list):
+        return [_escape_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _escape_value(v) for k, v in value.items()}
+    return value
+
+def _escape_resume_data(resume_data):
     """
-    Render resume preview
+    Build the HTML-escaped snapshot of the resume data used by the preview
     
     Args:
         resume_data (dict): Resume data from form inputs
+        
+    Returns:
+        dict: Escaped copy of the resume data, plus the derived header
+            fields 'name_upper' and 'contact_line_1'
     """
-    st.markdown("""
-    <style>
-    .preview-container {
-        background-color: white;
-        padding: 2rem;
-        border-radius: 8px;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        font-family: Arial, sans-serif;
-        color: #2c3e50;
-    }
-    .preview-name {
-        font-size: 24px;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 8px;
-    }
-    .preview-contact {
-        text-align: center;
-        font-size: 11px;
-        color: #555;
-        margin-bottom: 20px;
-    }
-    .preview-section-title {
-        font-size: 14px;
-        font-weight: bold;
-        color: #1f77b4;
-        border-bottom: 2px solid #1f77b4;
-        margin-top: 16px;
-        margin-bottom: 10px;
-        padding-bottom: 4px;
-    }
-    .preview-content {
-        font-size: 11px;
-        line-height: 1.6;
-        margin-bottom: 12px;
-    }
-    .preview-subtitle {
-        font-weight: bold;
-        color: #2c3e50;
-        margin-bottom: 4px;
-    }
-    .preview-meta {
-        font-size: 10px;
-        color: #666;
-        font-style: italic;
-    }
-    .preview-bullet {
-        margin-left: 20px;
-        margin-bottom: 4px;
-    }
-    .preview-skills {
-        display: flex;
-        flex-wrap: wrap;
-        gap: 8px;
-    }
-    .preview-skill-tag {
-        background-color: #e8f4f8;
-        color: #1f77b4;
-        padding: 4px 12px;
-        border-radius: 12px;
-        font-size: 10px;
-        font-weight: 500;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    preview_html = '<div class="preview-container">'
-    
-    # Header - Name and Contact
-    name = resume_data.get('name', 'Your Name')
-    email = resume_data.get('email', 'email@example.com')
-    phone = resume_data.get('phone', '+91-XXXXXXXXXX')
-    location = resume_data.get('location', 'City, Country')
-    linkedin = resume_data.get('linkedin', '')
-    portfolio = resume_data.get('portfolio', '')
-    
-    preview_html += f'<div class="preview-name">{name.upper()}</div>'
+    escaped = _escape_value(resume_data)
+    # Upper-case before escaping so entities like &amp; are left intact
+    escaped['name_upper'] = escape(resume_data.get('name', 'Your Name').upper())
     
-    contact_parts = [email, phone]
-    if linkedin:
+    contact_parts = [
+        escaped.get('email', 'email@example.com'),
+        escaped.get('phone', '+91-XXXXXXXXXX')
+    ]
+    if escaped.get('linkedin', ''):
         contact_parts.append('LinkedIn')
-    if portfolio:
+    if escaped.get('portfolio', ''):
         contact_parts.append('Portfolio')
-    contact_parts.append(location)
-    
-    preview_html += f'<div class="preview-contact">{" | ".join(contact_parts)}</div>'
-    
-    # Professional Summary
-    summary = resume_data.get('summary', '')
-    if summary:
-        preview_html += '<div class="preview-section-title">PROFESSIONAL SUMMARY</div>'
-        preview_html += f'<div class="preview-content">{summary}</div>'
+    contact_parts.append(escaped.get('location', 'City, Country'))
+    escaped['contact_line_1'] = ' | '.join(contact_parts)
+    return escaped
+
+def _header_html(resume_data):
+    """Name and contact line"""
+    return (f'<div class="preview-name">{resume_data["name_upper"]}</div>'
+            f'<div class="preview-contact">{resume_data["contact_line_1"]}</div>')
+
+def _summary_html(summary):
+    """Professional summary section"""
+    if not summary:
+        return ''
+    return ('<div class="preview-section-title">PROFESSIONAL SUMMARY</div>'
+            f'<div class="preview-content">{summary}</div>')
+
+def _education_html(education_list):
+    """Education section"""
+    if not education_list:
+        return ''
+    parts = ['<div class="preview-section-title">EDUCATION</div>']
+    for edu in education_list:
+        status_label = 'Graduated' if edu.get('status', 'Completed') == 'Completed' else 'Expected'
+        parts.append(_EDU_TMPL.format_map({**edu, 'status_label': status_label}))
+    return ''.join(parts)
+
+def _skills_html(tech_skills, soft_skills, tech_list=None, soft_list=None):
+    """Skills section with technical and soft skill tags, using pre-split lists when given"""
+    if not (tech_skills or soft_skills):
+        return ''
+    parts = ['<div class="preview-section-title">SKILLS</div>', '<div class="preview-content">']
     
-    # Education
-    education_list = resume_data.get('education_list', [])
-    if education_list:
-        preview_html += '<div class="preview-section-title">EDUCATION</div>'
-        for edu in education_list:
-            preview_html += f'<div class="preview-content">'
-            preview_html += f'<div class="preview-subtitle">{edu["degree"]} in {edu["field"]}</div>'
-            status = edu.get('status', 'Completed')
-            status_label = 'Graduated' if status == 'Completed' else 'Expected'
-            preview_html += f'<div class="preview-meta">{edu["institution"]} | {status_label}: {edu["year"]} | Grade: {edu["grade"]}</div>'
-            preview_html += '</div>'
+    if tech_skills:
+        parts.append('<div class="preview-subtitle">Technical Skills</div>')
+        parts.append('<div class="preview-skills">')
+        for skill in tech_list or split_skills_string(tech_skills):
+            parts.append(f'<span class="preview-skill-tag">{skill}</span>')
+        parts.append('</div>')
     
-    # Skills
-    tech_skills = resume_data.get('technical_skills', '')
-    soft_skills = resume_data.get('soft_skills', '')
+    if soft_skills:
+        parts.append('<div class="preview-subtitle" style="margin-top: 8px;">Soft Skills</div>')
+        parts.append('<div class="preview-skills">')
+        for skill in soft_list or split_skills_string(soft_skills):
+            parts.append(f'<span class="preview-skill-tag">{skill}</span>')
+        parts.append('</div>')
     
-    if tech_skills or soft_skills:
-        preview_html += '<div class="preview-section-title">SKILLS</div>'
-        preview_html += '<div class="preview-content">'
+    parts.append('</div>')
+    return ''.join(parts)
+
+def _experience_html(experience_list):
+    """Work experience section"""
+    if not experience_list:
+        return ''
+    parts = ['<div class="preview-section-title">WORK EXPERIENCE</div>']
+    for exp in experience_list:
+        meta = f'{exp["start_date"]} - {exp["end_date"]}'
+        if exp.get('location'):
+            meta += f' | {exp["location"]}'
+        parts.append(_EXP_HEAD_TMPL.format_map({**exp, 'meta': meta}))
+        
+        # Show bullet points if available, otherwise show responsibilities
+        bullets = exp.get('bullet_points', [])
+        if bullets:
+            for bullet in bullets:
+                parts.append(f'<div class="preview-bullet">• {bullet}</div>')
+        elif exp.get('responsibilities'):
+            # Split responsibilities into sentences for better display
+            for line in iter_sentences(exp['responsibilities']):
+                parts.append(f'<div class="preview-bullet">• {line}.</div>')
         
-        if tech_skills:
-            preview_html += '<div class="preview-subtitle">Technical Skills</div>'
-            preview_html += '<div class="preview-skills">'
-            skills_list = split_skills_string(tech_skills)
-            for skill in skills_list:
-                preview_html += f'<span class="preview-skill-tag">{skill}</span>'
-            preview_html += '</div>'
+        parts.append('</div>')
+    return ''.join(parts)
+
+def _projects_html(projects_list):
+    """Projects section"""
+    if not projects_list:
+        return ''
+    parts = ['<div class="preview-section-title">PROJECTS</div>']
+    for proj in projects_list:
+        parts.append(_PROJ_HEAD_TMPL.format_map(proj))
         
-        if soft_skills:
-            preview_html += '<div class="preview-subtitle" style="margin-top: 8px;">Soft Skills</div>'
-            preview_html += '<div class="preview-skills">'
-            skills_list = split_skills_string(soft_skills)
-            for skill in skills_list:
-                preview_html += f'<span class="preview-skill-tag">{skill}</span>'
-            preview_html += '</div>'
+        meta_parts = []
+        if proj.get('duration'):
+            meta_parts.append(proj['duration'])
+        if proj.get('technologies'):
+            meta_parts.append(f"Tech: {proj['technologies']}")
+        if meta_parts:
+            parts.append(f'<div class="preview-meta">{" | ".join(meta_parts)}</div>')
         
-        preview_html += '</div>'
-    
-    # Work Experience
-    experience_list = resume_data.get('experience_list', [])
-    if experience_list:
-        preview_html += '<div class="preview-section-title">WORK EXPERIENCE</div>'
-        for exp in experience_list:
-            preview_html += '<div class="preview-content">'
-            preview_html += f'<div class="preview-subtitle">{exp["job_title"]} | {exp["company"]}</div>'
-            duration = f'{exp["start_date"]} - {exp["end_date"]}'
-            if exp.get('location'):
-                preview_html += f'<div class="preview-meta">{duration} | {exp["location"]}</div>'
-            else:
-                preview_html += f'<div class="preview-meta">{duration}</div>'
-            
-            # Show bullet points if available, otherwise show responsibilities
-            bullets = exp.get('bullet_points', [])
-            if bullets:
-                for bullet in bullets:
-                    preview_html += f'<div class="preview-bullet">• {bullet}</div>'
-            elif exp.get('responsibilities'):
-                # Split responsibilities into sentences for better display
-                resp_lines = exp['responsibilities'].split('.')
-                for line in resp_lines:
-                    line = line.strip()
-                    if line:
-                        preview_html += f'<div class="preview-bullet">• {line}.</div>'
-            
-            preview_html += '</div>'
+        # Show bullet points if available (STAR methodology)
+        bullet_points = proj.get('bullet_points', [])
+        if bullet_points:
+            parts.append('<ul style="margin: 8px 0; padding-left: 20px;">')
+            for bullet in bullet_points:
+                parts.append(f'<li style="margin: 4px 0;">{bullet}</li>')
+            parts.append('</ul>')
+        else:
+            # Fallback to description if no bullets
+            description = proj.get('description', '')
+            if description:
+                parts.append(f'<div style="margin-top: 4px;">{description}</div>')
+        
+        if proj.get('url'):
+            parts.append(f'<div class="preview-meta">URL: {proj["url"]}</div>')
+        
+        parts.append('</div>')
+    return ''.join(parts)
+
+def _certifications_html(certifications):
+    """Certifications & achievements section"""
+    if not certifications:
+        return ''
+    parts = ['<div class="preview-section-title">CERTIFICATIONS & ACHIEVEMENTS</div>',
+             '<div class="preview-content">']
+    for cert in iter_lines(certifications):
+        parts.append(f'<div class="preview-bullet">• {cert}</div>')
+    parts.append('</div>')
+    return ''.join(parts)
+
+def render_resume_preview(resume_data):
+    """
+    Render resume preview
     
-    # Projects
-    projects_list = resume_data.get('projects_list', [])
-    if projects_list:
-        preview_html += '<div class="preview-section-title">PROJECTS</div>'
-        for proj in projects_list:
-            preview_html += '<div class="preview-content">'
-            preview_html += f'<div class="preview-subtitle">{proj["title"]}</div>'
-            
-            meta_parts = []
-            if proj.get('duration'):
-                meta_parts.append(proj['duration'])
-            if proj.get('technologies'):
-                meta_parts.append(f"Tech: {proj['technologies']}")
-            if meta_parts:
-                preview_html += f'<div class="preview-meta">{" | ".join(meta_parts)}</div>'
-            
-            # Show bullet points if available (STAR methodology)
-            bullet_points = proj.get('bullet_points', [])
-            if bullet_points:
-                preview_html += '<ul style="margin: 8px 0; padding-left: 20px;">'
-                for bullet in bullet_points:
-                    preview_html += f'<li style="margin: 4px 0;">{bullet}</li>'
-                preview_html += '</ul>'
-            else:
-                # Fallback to description if no bullets
-                description = proj.get('description', '')
-                if description:
-                    preview_html += f'<div style="margin-top: 4px;">{description}</div>'
-            
-            if proj.get('url'):
-                preview_html += f'<div class="preview-meta">URL: {proj["url"]}</div>'
-            
-            preview_html += '</div>'
+    Args:
+        resume_data (dict): Resume data from form inputs
+    """
+    st.markdown(_PREVIEW_CSS, unsafe_allow_html=True)
     
-    # Certifications & Achievements
-    certifications = resume_data.get('certifications', '')
-    if certifications:
-        preview_html += '<div class="preview-section-title">CERTIFICATIONS & ACHIEVEMENTS</div>'
-        preview_html += '<div class="preview-content">'
-        cert_lines = certifications.split('\n')
-        for cert in cert_lines:
-            cert = cert.strip()
-            if cert:
-                preview_html += f'<div class="preview-bullet">• {cert}</div>'
-        preview_html += '</div>'
+    # User input is interpolated into raw HTML, escape all of it once up front
+    resume_data = _escape_resume_data(resume_data)
     
-    preview_html += '</div>'
+    preview_html = _PREVIEW_MASTER.format_map({
+        'header': _header_html(resume_data),
+        'summary': _summary_html(resume_data.get('summary', '')),
+        'education': _education_html(resume_data.get('education_list', [])),
+        'skills': _skills_html(resume_data.get('technical_skills', ''),
+                               resume_data.get('soft_skills', ''),
+                               resume_data.get('_technical_skills_list'),
+                               resume_data.get('_soft_skills_list')),
+        'experience': _experience_html(resume_data.get('experience_list', [])),
+        'projects': _projects_html(resume_data.get('projects_list', [])),
+        'certifications': _certifications_html(resume_data.get('certifications', ''))
+    })
     
     st.markdown(preview_html, unsafe_allow_html=True)
 
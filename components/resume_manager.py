@@ -3,43 +3,46 @@ Resume Management UI Components
 Save, load, and manage resumes locally
 """
 
+import copy
 import streamlit as st
-from utils.storage import LocalStorage
+from utils.storage import get_storage
 from datetime import datetime
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _load_resume_cb(resume):
+    """
+    Load a saved resume into session state
+    
+    Runs as the Load button's on_click callback, i.e. before the script
+    reruns, so the form widgets pick the values up on that same run.
+    """
+    # Copy, so editing the loaded form does not change the saved resume
+    for key, value in copy.deepcopy(resume['data']).items():
+        st.session_state[key] = value
+    st.session_state['_loaded_resume_name'] = resume['name']
+
 
 def handle_resume_load_pre_render():
     """
-    Handle resume loading BEFORE widgets are rendered
-    This prevents session state widget conflicts
+    Show the confirmation for a resume loaded by the Load button
     Must be called at the top of render_builder_page()
     """
-    if st.session_state.get('_load_resume_pending'):
-        # Clear the flag
-        st.session_state['_load_resume_pending'] = False
-        
-        # Get the resume to load
-        resume = st.session_state.get('_resume_to_load')
-        
-        if resume:
-            # Load all resume data into session state
-            for key, value in resume['data'].items():
-                st.session_state[key] = value
-            
-            # Show success message
-            st.success(f"✅ Loaded: {resume['name']}")
-            
-            # Clear the temporary storage
-            if '_resume_to_load' in st.session_state:
-                del st.session_state['_resume_to_load']
+    loaded_name = st.session_state.pop('_loaded_resume_name', None)
+    if loaded_name:
+        st.success(f"✅ Loaded: {loaded_name}")
 
 
 def render_save_resume_section(resume_data: dict):
     """Render save resume section"""
     st.subheader("💾 Save Resume")
     
-    storage = LocalStorage()
+    storage = get_storage()
     
     # Resume name input
     col1, col2 = st.columns([3, 1])
@@ -67,11 +70,29 @@ def render_save_resume_section(resume_data: dict):
                 st.error("Failed to save resume")
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
+def _format_resume_options(resumes_sig: tuple) -> list:
+    """
+    Build the load selectbox labels
+    
+    Args:
+        resumes_sig: (name, target_role, updated_at) per saved resume; any
+            save changes updated_at, so a stale entry is never returned
+        
+    Returns:
+        list: One label per resume
+    """
+    return [
+        f"{name} - {target_role or 'No role'} (Updated: {updated_at[:10]})"
+        for name, target_role, updated_at in resumes_sig
+    ]
+
+
 def render_load_resume_section():
     """Render load resume section"""
     st.subheader("📂 Load Saved Resume")
     
-    storage = LocalStorage()
+    storage = get_storage()
     saved_resumes = storage.get_all_resumes()
     
     if not saved_resumes:
@@ -79,10 +100,9 @@ def render_load_resume_section():
         return
     
     # Create resume selection options
-    resume_options = [
-        f"{r['name']} - {r['target_role'] or 'No role'} (Updated: {r['updated_at'][:10]})"
-        for r in saved_resumes
-    ]
+    resume_options = _format_resume_options(
+        tuple((r['name'], r['target_role'], r['updated_at']) for r in saved_resumes)
+    )
     
     selected = st.selectbox(
         "Select Resume",
@@ -91,19 +111,16 @@ def render_load_resume_section():
     )
     
     if selected:
-        # Extract resume name from selection
-        resume_name = selected.split(" - ")[0]
-        resume = storage.get_resume(resume_name)
+        # Labels line up with saved_resumes, so pick the entry by position
+        resume = saved_resumes[resume_options.index(selected)]
+        resume_name = resume['name']
         
         if resume:
             col1, col2, col3 = st.columns([2, 2, 1])
             
             with col1:
-                if st.button("📥 Load Resume", type="primary", use_container_width=True, key=f"load_resume_{resume_name}"):
-                    # Set flag to load resume data (will be processed before widgets render)
-                    st.session_state['_load_resume_pending'] = True
-                    st.session_state['_resume_to_load'] = resume
-                    st.rerun()
+                st.button("📥 Load Resume", type="primary", use_container_width=True, key=f"load_resume_{resume_name}",
+                          on_click=_load_resume_cb, args=(resume,))
             
             with col2:
                 if st.button("ℹ️ Details", use_container_width=True, key=f"details_{resume_name}"):
@@ -114,8 +131,8 @@ def render_load_resume_section():
                         st.write(f"**Updated:** {resume['updated_at'][:10]}")
                         
                         # Show cover letters count
-                        cover_letters = storage.get_cover_letters_for_resume(resume['name'])
-                        st.write(f"**Cover Letters:** {len(cover_letters)}")
+                        cover_letter_count = storage.count_cover_letters_for_resume(resume['name'])
+                        st.write(f"**Cover Letters:** {cover_letter_count}")
             
             with col3:
                 if st.button("🗑️ Delete", type="secondary", use_container_width=True, key=f"delete_{resume_name}"):
@@ -133,7 +150,7 @@ def render_export_import_section():
     """Render export/import data section"""
     st.subheader("📤 Export / Import Data")
     
-    storage = LocalStorage()
+    storage = get_storage()
     
     col1, col2 = st.columns(2)
     
@@ -142,7 +159,7 @@ def render_export_import_section():
         st.caption("Download all your resumes and cover letters as a JSON file")
         
         if st.button("📥 Export to File", use_container_width=True, key="export_data_btn"):
-            json_data = storage.export_all_data()
+            json_data = storage.export_all_data_bytes()
             
             st.download_button(
                 label="💾 Download JSON File",
@@ -166,8 +183,13 @@ def render_export_import_section():
         
         if uploaded_file is not None:
             try:
-                json_str = uploaded_file.read().decode('utf-8')
-                if storage.import_data(json_str):
+                # Parse from the upload buffer rather than reading the file object
+                if orjson is not None:
+                    data = orjson.loads(uploaded_file.getbuffer())
+                else:
+                    # stdlib json takes bytes, not a memoryview, and detects UTF-8/16/32
+                    data = json.loads(bytes(uploaded_file.getbuffer()))
+                if storage.import_data_obj(data):
                     st.success("✅ Data imported successfully!")
                     st.rerun()
                 else:
@@ -176,9 +198,26 @@ def render_export_import_section():
                 st.error(f"❌ Error reading file: {str(e)}")
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
+def _format_cover_letter_resume_options(resumes_sig: tuple) -> list:
+    """
+    Build the cover letter resume selectbox labels
+    
+    Args:
+        resumes_sig: (name, target_role) per saved resume
+        
+    Returns:
+        list: One label per resume
+    """
+    return [
+        f"{name} - {target_role or 'No role specified'}"
+        for name, target_role in resumes_sig
+    ]
+
+
 def render_resume_selector_for_cover_letter():
     """Render resume selector for cover letter generation"""
-    storage = LocalStorage()
+    storage = get_storage()
     saved_resumes = storage.get_all_resumes()
     
     if not saved_resumes:
@@ -187,21 +226,20 @@ def render_resume_selector_for_cover_letter():
     
     st.info("📋 Select a resume to use for this cover letter:")
     
-    # Create resume selection options
-    resume_options = {
-        f"{r['name']} - {r['target_role'] or 'No role specified'}": r['name']
-        for r in saved_resumes
-    }
+    # Create resume selection options, one label per saved resume in the same order
+    resume_options = _format_cover_letter_resume_options(
+        tuple((r['name'], r['target_role']) for r in saved_resumes)
+    )
     
     selected = st.selectbox(
         "Choose Resume",
-        options=list(resume_options.keys()),
+        options=resume_options,
         help="The cover letter will use information from this resume"
     )
     
     if selected:
-        resume_name = resume_options[selected]
-        resume = storage.get_resume(resume_name)
+        resume = saved_resumes[resume_options.index(selected)]
+        resume_name = resume['name']
         
         col1, col2 = st.columns([3, 1])
         
@@ -236,13 +274,15 @@ def render_resume_selector_for_cover_letter():
 
 def render_save_cover_letter_section():
     """Render save cover letter section"""
-    if not st.session_state.get('cover_letter_content'):
+    session = st.session_state
+    content = session.get('cover_letter_content', '')
+    if not content:
         st.info("💡 Generate a cover letter first to save it")
         return
     
     st.subheader("💾 Save Cover Letter")
     
-    storage = LocalStorage()
+    storage = get_storage()
     
     col1, col2 = st.columns([3, 1])
     
@@ -261,10 +301,9 @@ def render_save_cover_letter_section():
         if not cover_letter_name.strip():
             st.error("Please enter a name for the cover letter")
         else:
-            resume_name = st.session_state.get('cl_linked_resume_name', 'Unlinked')
-            company = st.session_state.get('cl_company', '')
-            job_title = st.session_state.get('cl_job_title', '')
-            content = st.session_state.get('cover_letter_content', '')
+            resume_name = session.get('cl_linked_resume_name', 'Unlinked')
+            company = session.get('cl_company', '')
+            job_title = session.get('cl_job_title', '')
             
             if storage.save_cover_letter(cover_letter_name, resume_name, company, job_title, content):
                 st.success(f"✅ Cover letter '{cover_letter_name}' saved!")
@@ -3,41 +3,81 @@ Classic Resume Template
 Professional template for resume PDF generation
 """
 
+from typing import NamedTuple, Tuple
+
+
+class _Colors(NamedTuple):
+    """Color scheme (RGB)"""
+    primary: Tuple[int, int, int]
+    text: Tuple[int, int, int]
+    meta: Tuple[int, int, int]
+    accent: Tuple[int, int, int]
+
+
+class _FontSizes(NamedTuple):
+    """Font sizes in points"""
+    name: int
+    section_title: int
+    subtitle: int
+    body: int
+    meta: int
+
+
+class _Spacing(NamedTuple):
+    """Vertical spacing in mm"""
+    section: int
+    subsection: int
+    paragraph: int
+    line: int
+
+
+class _Margins(NamedTuple):
+    """Page margins in mm"""
+    top: int
+    bottom: int
+    left: int
+    right: int
+
+
 class ClassicTemplate:
     """Classic resume template configuration"""
     
-    # Color scheme (RGB)
-    COLORS = {
-        'primary': (31, 119, 180),      # Blue
-        'text': (0, 0, 0),              # Black
-        'meta': (100, 100, 100),        # Gray
-        'accent': (52, 73, 94)          # Dark gray
-    }
+    # Color scheme (RGB), read as ClassicTemplate.COLORS.primary
+    COLORS = _Colors(
+        primary=(31, 119, 180),     # Blue
+        text=(0, 0, 0),             # Black
+        meta=(100, 100, 100),       # Gray
+        accent=(52, 73, 94)         # Dark gray
+    )
     
     # Font sizes
-    FONT_SIZES = {
-        'name': 20,
-        'section_title': 12,
-        'subtitle': 11,
-        'body': 11,
-        'meta': 10
-    }
+    FONT_SIZES = _FontSizes(
+        name=20,
+        section_title=12,
+        subtitle=11,
+        body=11,
+        meta=10
+    )
     
     # Spacing
-    SPACING = {
-        'section': 5,
-        'subsection': 3,
-        'paragraph': 2,
-        'line': 5
-    }
+    SPACING = _Spacing(
+        section=5,
+        subsection=3,
+        paragraph=2,
+        line=5
+    )
     
     # Margins
-    MARGINS = {
-        'top': 15,
-        'bottom': 15,
-        'left': 10,
-        'right': 10
-    }
+    MARGINS = _Margins(
+        top=15,
+        bottom=15,
+        left=10,
+        right=10
+    )
+    
+    # Bullet point character (U+2022; chr(149) is a C1 control code, which
+    # only happens to show as a bullet when read as cp1252)
+    BULLET = '\u2022'
     
     @staticmethod
     def get_section_order():
@@ -54,4 +94,4 @@ class ClassicTemplate:
     @staticmethod
     def get_bullet_character():
         """Get bullet point character"""
-        return chr(149)  # •
+        return ClassicTemplate.BULLET
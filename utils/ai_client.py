@@ -4,12 +4,27 @@ Automatically selects between Gemini and OpenRouter based on available API keys
 """
 
 import os
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
 from dotenv import load_dotenv
+from utils.ai_errors import AIError
+from utils.prompts import prompt_key
+from utils.storage import get_storage
 
 # Load environment variables
 load_dotenv()
 
 
+def _package_installed(name):
+    """Check whether a package can be imported, without importing it"""
+    try:
+        return find_spec(name) is not None
+    except ModuleNotFoundError:
+        # A parent package (e.g. 'google') is missing
+        return False
+
+
 class AIClient:
     """Unified client that uses Gemini or OpenRouter based on configuration"""
     
@@ -22,7 +37,9 @@ class AIClient:
         gemini_key = os.getenv("GEMINI_API_KEY")
         openrouter_key = os.getenv("OPENROUTER_API_KEY")
         
-        if gemini_key:
+        if gemini_key and not _package_installed("google.generativeai"):
+            print("Skipping Gemini: google-generativeai is not installed")
+        elif gemini_key:
             try:
                 from utils.gemini_client import GeminiClient
                 self.client = GeminiClient()
@@ -32,7 +49,9 @@ class AIClient:
                 print(f"Failed to initialize Gemini: {e}")
         
         # Fallback to OpenRouter
-        if openrouter_key:
+        if openrouter_key and not _package_installed("requests"):
+            print("Skipping OpenRouter: requests is not installed")
+        elif openrouter_key:
             try:
                 from utils.openrouter_client import OpenRouterClient
                 self.client = OpenRouterClient()
@@ -44,12 +63,30 @@ class AIClient:
         # No API keys available
         raise ValueError("No AI API keys found. Please configure GEMINI_API_KEY or OPENROUTER_API_KEY in .env file")
     
-    def generate_content(self, prompt):
+    def _cache_key(self, prompt):
+        """Key a response by provider, model, temperature and prompt content"""
+        model = getattr(self.client.model, 'model_name', self.client.model)
+        temperature = self.client.generation_config.get('temperature')
+        return f"{self.provider}:{model}:{temperature}:{prompt_key(prompt)}"
+    
+    def _request_uncached(self, prompt):
+        """Send one request, returning (text, succeeded)"""
+        try:
+            return self.client.request(prompt), True
+        except AIError as e:
+            return e.message, False
+    
+    def generate_content(self, prompt, use_cache=True):
         """
         Generate content using available AI provider
         
+        Successful responses are cached for the session, so an identical
+        request is answered without calling the API again.
+        
         Args:
             prompt (str): The prompt to send to the API
+            use_cache (bool): Whether to reuse a cached response (False to
+                force a fresh generation, e.g. for "Regenerate")
             
         Returns:
             str: Generated content or error message
@@ -57,7 +94,63 @@ class AIClient:
         if not self.client:
             return "No AI provider configured. Please add API keys to .env file."
         
-        return self.client.generate_content(prompt)
+        storage = get_storage()
+        key = self._cache_key(prompt)
+        if use_cache:
+            cached = storage.get_llm_response(key)
+            if cached is not None:
+                return cached
+        
+        result, succeeded = self._request_uncached(prompt)
+        if succeeded:
+            storage.save_llm_response(key, result)
+        return result
+    
+    def generate_batch(self, prompts, max_workers=4, use_cache=True):
+        """
+        Generate content for several independent prompts concurrently
+        
+        Args:
+            prompts (list): Prompts to send
+            max_workers (int): Maximum number of requests in flight at once
+            use_cache (bool): Whether to reuse cached responses (False to
+                force fresh generations)
+            
+        Returns:
+            list: Generated content or error message per prompt, in input order
+        """
+        if not self.client:
+            return ["No AI provider configured. Please add API keys to .env file."] * len(prompts)
+        
+        # Session state is only reachable from the script thread, so the cache
+        # is consulted and filled here and only the misses go to the pool
+        storage = get_storage()
+        keys = [self._cache_key(prompt) for prompt in prompts]
+        if use_cache:
+            results = [storage.get_llm_response(key) for key in keys]
+        else:
+            results = [None] * len(prompts)
+        
+        # Positions of each uncached request, so duplicates are only sent once
+        pending = {}
+        for i, result in enumerate(results):
+            if result is None:
+                pending.setdefault(keys[i], []).append(i)
+        to_send = [prompts[indices[0]] for indices in pending.values()]
+        
+        if len(to_send) <= 1:
+            responses = [self._request_uncached(prompt) for prompt in to_send]
+        else:
+            # Requests are network-bound, so threads overlap the waiting
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(to_send))) as executor:
+                responses = list(executor.map(self._request_uncached, to_send))
+        
+        for (key, indices), (result, succeeded) in zip(pending.items(), responses):
+            for i in indices:
+                results[i] = result
+            if succeeded:
+                storage.save_llm_response(key, result)
+        return results
     
     def generate_with_retry(self, prompt, max_retries=2):
         """
@@ -78,3 +171,17 @@ class AIClient:
     def get_provider_name(self):
         """Get the name of the active AI provider"""
         return self.provider if self.provider else "None"
+
+
+@st.cache_resource
+def get_ai_client():
+    """
+    Get the shared AIClient, created once per server process
+    
+    A failed initialization raises and is not cached, so it is retried on the
+    next call (e.g. after an API key has been added).
+    
+    Returns:
+        AIClient instance
+    """
+    return AIClient()
@@ -0,0 +1,42 @@
+"""
+AI Provider Errors for SmartResume AI
+Typed failures raised by the provider clients and handled by their retry logic
+"""
+
+
+class AIError(Exception):
+    """
+    A failed AI request
+    
+    Attributes:
+        category (str): One of 'rate', 'auth', 'timeout', 'network' or 'other'
+        message (str): User-facing error message
+        retry_after (float): Seconds the provider asked us to wait, if given
+    """
+    
+    def __init__(self, category, message, retry_after=None):
+        super().__init__(message)
+        self.category = category
+        self.message = message
+        self.retry_after = retry_after
+    
+    @property
+    def retryable(self):
+        """Whether retrying the same request can succeed"""
+        return self.category != 'auth'
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header given in seconds
+    
+    Args:
+        value (str): Header value, may be None
+        
+    Returns:
+        float: Seconds to wait, or None if absent or not a number
+    """
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
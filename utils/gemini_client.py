@@ -4,12 +4,41 @@ Handles all interactions with Google's Gemini API
 """
 
 import os
-import google.generativeai as genai
+import threading
+import time
 from dotenv import load_dotenv
+from google.api_core import exceptions as google_exceptions
+from utils.ai_errors import AIError
 
 # Load environment variables
 load_dotenv()
 
+# Fallback (substring, category) checks for errors the SDK does not type
+# precisely; an invalid key, for example, arrives as InvalidArgument
+_ERROR_KEYWORDS = (
+    ('quota', 'rate'),
+    ('rate', 'rate'),
+    ('api key', 'auth'),
+)
+
+_ERROR_MESSAGES = {
+    'rate': "Rate limit exceeded. Please wait a moment and try again.",
+    'auth': "Invalid API key. Please check your configuration.",
+}
+
+# Set once the connection warmup has been started in this process
+_warmup_started = False
+
+
+def _warm_up(model):
+    """Open the model's API connection ahead of the first real request"""
+    try:
+        # count_tokens goes through the same client as generate_content
+        # but generates nothing, so it costs no output tokens
+        model.count_tokens("ok")
+    except Exception:
+        pass  # Best effort; the first request just pays the setup cost instead
+
 class GeminiClient:
     """Client for interacting with Google Gemini API"""
     
@@ -19,12 +48,21 @@ class GeminiClient:
         if not api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
         
+        # Imported here so the SDK's dependency tree only loads when Gemini is used
+        import google.generativeai as genai
         genai.configure(api_key=api_key)
         try:
             self.model = genai.GenerativeModel('gemini-2.5-flash')
         except:
             self.model = genai.GenerativeModel('gemini-pro')
         
+        # Warm the connection in the background so the first generation
+        # doesn't also pay for connection setup
+        global _warmup_started
+        if not _warmup_started:
+            _warmup_started = True
+            threading.Thread(target=_warm_up, args=(self.model,), daemon=True).start()
+        
         # Generation configuration
         self.generation_config = {
             "temperature": 0.7,
@@ -43,20 +81,40 @@ class GeminiClient:
         Returns:
             str: Generated content or error message
         """
+        try:
+            return self.request(prompt)
+        except AIError as e:
+            return e.message
+    
+    def request(self, prompt):
+        """
+        Send a single request to the Gemini API
+        
+        Args:
+            prompt (str): The prompt to send to the API
+            
+        Returns:
+            str: Generated content
+            
+        Raises:
+            AIError: If the request failed
+        """
         try:
             response = self.model.generate_content(
                 prompt,
                 generation_config=self.generation_config
             )
             return response.text.strip()
+        except google_exceptions.ResourceExhausted:
+            raise AIError('rate', _ERROR_MESSAGES['rate'])
+        except (google_exceptions.Unauthenticated, google_exceptions.PermissionDenied):
+            raise AIError('auth', _ERROR_MESSAGES['auth'])
         except Exception as e:
             error_msg = str(e).lower()
-            if "quota" in error_msg or "rate" in error_msg:
-                return "Rate limit exceeded. Please wait a moment and try again."
-            elif "api key" in error_msg:
-                return "Invalid API key. Please check your configuration."
-            else:
-                return f"An error occurred: {str(e)}"
+            for keyword, category in _ERROR_KEYWORDS:
+                if keyword in error_msg:
+                    raise AIError(category, _ERROR_MESSAGES[category])
+            raise AIError('other', f"An error occurred: {str(e)}")
     
     def generate_with_retry(self, prompt, max_retries=2):
         """
@@ -70,10 +128,12 @@ class GeminiClient:
             str: Generated content or error message
         """
         for attempt in range(max_retries + 1):
-            result = self.generate_content(prompt)
-            if not result.startswith("Rate limit") and not result.startswith("Invalid") and not result.startswith("An error"):
-                return result
+            try:
+                return self.request(prompt)
+            except AIError as e:
+                error = e
+            if not error.retryable:
+                break  # An invalid key will not fix itself
             if attempt < max_retries:
-                import time
                 time.sleep(2 ** attempt)  # Exponential backoff
-        return result
+        return error.message
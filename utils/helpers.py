@@ -2,7 +2,30 @@
 Helper utility functions for SmartResume AI
 """
 
+import re
 from datetime import datetime
+from functools import lru_cache
+
+# Runs of characters between line breaks / sentence-ending periods
+_NONBLANK_LINE = re.compile(r'[^\n]+')
+_SENTENCE = re.compile(r'[^.]+')
+
+# Markdown bold/italic markers (**text**, *text*, __text__, _text_)
+_MD_BOLD_STAR = re.compile(r'\*\*([^*]+)\*\*')
+_MD_ITALIC_STAR = re.compile(r'\*([^*]+)\*')
+_MD_BOLD_UNDERSCORE = re.compile(r'__([^_]+)__')
+_MD_ITALIC_UNDERSCORE = re.compile(r'_([^_]+)_')
+
+# Characters dropped from phone numbers and from generated filenames
+_PHONE_DISALLOWED = re.compile(r'[^\d+]')
+_FILENAME_DISALLOWED = re.compile(r'[^\w\s]|_')
+
+# Characters that already end a bullet point sentence
+_SENTENCE_END = frozenset('.!?')
+
+# Leading whitespace plus bullet markers, or trailing whitespace, on each line
+# ([^\S\n] is whitespace other than the line break itself)
+_BULLET_LINE_EDGES = re.compile(r'^[^\S\n]*[•\-*→▸▪ ]*|[^\S\n]+$', re.MULTILINE)
 
 def format_phone_number(phone):
     """
@@ -15,8 +38,7 @@ def format_phone_number(phone):
         str: Formatted phone number
     """
     # Remove all non-digit characters except +
-    cleaned = ''.join(c for c in phone if c.isdigit() or c == '+')
-    return cleaned
+    return _PHONE_DISALLOWED.sub('', phone)
 
 def format_date_range(start_date, end_date=None, is_current=False):
     """
@@ -87,7 +109,7 @@ def generate_filename(name):
         str: Sanitized filename
     """
     # Remove special characters and replace spaces
-    filename = ''.join(c if c.isalnum() or c.isspace() else '' for c in name)
+    filename = _FILENAME_DISALLOWED.sub('', name)
     filename = '_'.join(filename.split())
     return f"{filename}_Resume.pdf"
 
@@ -106,6 +128,36 @@ def split_skills_string(skills_string):
     skills = [s.strip() for s in skills_string.split(',')]
     return [s for s in skills if s]  # Remove empty strings
 
+def iter_lines(text):
+    """
+    Iterate over the non-empty lines of text
+    
+    Args:
+        text (str): Multi-line text
+        
+    Yields:
+        str: Each stripped, non-empty line
+    """
+    for match in _NONBLANK_LINE.finditer(text):
+        line = match.group().strip()
+        if line:
+            yield line
+
+def iter_sentences(text):
+    """
+    Iterate over the period-separated sentences of text
+    
+    Args:
+        text (str): Free-form text
+        
+    Yields:
+        str: Each stripped, non-empty sentence without its trailing period
+    """
+    for match in _SENTENCE.finditer(text):
+        sentence = match.group().strip()
+        if sentence:
+            yield sentence
+
 def join_skills_list(skills_list):
     """
     Join list of skills into comma-separated string
@@ -126,7 +178,34 @@ def get_current_year():
 
 def get_current_month_year():
     """Get current month and year formatted"""
-    return datetime.now().strftime("%B %Y")
+    now = datetime.now()
+    return _format_month_year(now.year, now.month)
+
+@lru_cache(maxsize=1)
+def _format_month_year(year, month):
+    """Format a month once; the value only changes when the month does"""
+    return datetime(year, month, 1).strftime("%B %Y")
+
+def strip_markdown(text):
+    """
+    Remove markdown bold/italic markers from text
+    
+    Each marker family is only scanned for when its delimiter character is
+    present, so plain text skips the regex engine entirely.
+    
+    Args:
+        text (str): Input text
+        
+    Returns:
+        str: Text without markdown emphasis markers
+    """
+    if '*' in text:
+        text = _MD_BOLD_STAR.sub(r'\1', text)
+        text = _MD_ITALIC_STAR.sub(r'\1', text)
+    if '_' in text:
+        text = _MD_BOLD_UNDERSCORE.sub(r'\1', text)
+        text = _MD_ITALIC_UNDERSCORE.sub(r'\1', text)
+    return text
 
 def clean_bullet_points(text):
     """
@@ -141,17 +220,8 @@ def clean_bullet_points(text):
     if not text:
         return []
     
-    lines = text.strip().split('\n')
-    bullet_points = []
-    
-    for line in lines:
-        line = line.strip()
-        # Remove common bullet point markers
-        line = line.lstrip('•-*→▸▪ ')
-        if line:
-            bullet_points.append(line)
-    
-    return bullet_points
+    # Strip whitespace and common bullet point markers from every line in one pass
+    return [line for line in _BULLET_LINE_EDGES.sub('', text).split('\n') if line]
 
 def format_bullet_point(text):
     """
@@ -168,6 +238,30 @@ def format_bullet_point(text):
     if text and text[0].islower():
         text = text[0].upper() + text[1:]
     # Ensure it ends with period
-    if text and text[-1] not in '.!?':
+    if text and text[-1] not in _SENTENCE_END:
         text += '.'
     return text
+
+def format_bullet_points(lines):
+    """
+    Format a list of bullet points in one pass
+    
+    Same rules as format_bullet_point, inlined to skip a function call per line.
+    
+    Args:
+        lines (list): Bullet point texts
+        
+    Returns:
+        list: Formatted bullet points
+    """
+    formatted = []
+    append = formatted.append
+    for text in lines:
+        text = text.strip()
+        if text:
+            if text[0].islower():
+                text = text[0].upper() + text[1:]
+            if text[-1] not in _SENTENCE_END:
+                text += '.'
+        append(text)
+    return formatted
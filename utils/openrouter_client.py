@@ -4,9 +4,10 @@ Handles interactions with OpenRouter API (alternative to Gemini)
 """
 
 import os
+import time
 import requests
-import json
 from dotenv import load_dotenv
+from utils.ai_errors import AIError, parse_retry_after
 
 # Load environment variables
 load_dotenv()
@@ -26,6 +27,15 @@ class OpenRouterClient:
         
         self.api_url = "https://openrouter.ai/api/v1/chat/completions"
         
+        # Reuse one connection pool so retries and later calls skip the TCP/TLS handshake
+        self._session = requests.Session()
+        self._session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self._session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "HTTP-Referer": self.site_url,
+            "X-Title": self.site_name,
+        })
+        
         # Default to free model
         self.model = "google/gemma-3-27b-it:free"
         
@@ -47,13 +57,24 @@ class OpenRouterClient:
             str: Generated content or error message
         """
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": self.site_url,
-                "X-Title": self.site_name,
-            }
+            return self.request(prompt)
+        except AIError as e:
+            return e.message
+    
+    def request(self, prompt):
+        """
+        Send a single request to the OpenRouter API
+        
+        Args:
+            prompt (str): The prompt to send to the API
             
+        Returns:
+            str: Generated content
+            
+        Raises:
+            AIError: If the request failed
+        """
+        try:
             data = {
                 "model": self.model,
                 "messages": [
@@ -65,10 +86,9 @@ class OpenRouterClient:
                 **self.generation_config
             }
             
-            response = requests.post(
+            response = self._session.post(
                 url=self.api_url,
-                headers=headers,
-                data=json.dumps(data),
+                json=data,
                 timeout=30
             )
             
@@ -81,27 +101,34 @@ class OpenRouterClient:
                     content = result["choices"][0]["message"]["content"]
                     return content.strip()
                 else:
-                    return "Error: No content generated"
+                    raise AIError('other', "Error: No content generated")
             
             elif response.status_code == 429:
-                return "Rate limit exceeded. Please wait a moment and try again."
+                raise AIError(
+                    'rate',
+                    "Rate limit exceeded. Please wait a moment and try again.",
+                    retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                )
             
             elif response.status_code == 401:
-                return "Invalid API key. Please check your configuration."
+                raise AIError('auth', "Invalid API key. Please check your configuration.")
             
             else:
                 error_data = response.json() if response.content else {}
                 error_msg = error_data.get("error", {}).get("message", "Unknown error")
-                return f"An error occurred: {error_msg}"
-                
+                raise AIError('other', f"An error occurred: {error_msg}")
+        
+        except AIError:
+            raise
+        
         except requests.exceptions.Timeout:
-            return "Request timed out. Please try again."
+            raise AIError('timeout', "Request timed out. Please try again.")
         
         except requests.exceptions.ConnectionError:
-            return "Connection error. Please check your internet connection."
+            raise AIError('network', "Connection error. Please check your internet connection.")
         
         except Exception as e:
-            return f"An error occurred: {str(e)}"
+            raise AIError('other', f"An error occurred: {str(e)}")
     
     def generate_with_retry(self, prompt, max_retries=2):
         """
@@ -115,20 +142,17 @@ class OpenRouterClient:
             str: Generated content or error message
         """
         for attempt in range(max_retries + 1):
-            result = self.generate_content(prompt)
+            try:
+                return self.request(prompt)
+            except AIError as e:
+                error = e
             
-            # Check if result is an error
-            if not result.startswith("Rate limit") and \
-               not result.startswith("Invalid") and \
-               not result.startswith("An error") and \
-               not result.startswith("Error:") and \
-               not result.startswith("Request timed") and \
-               not result.startswith("Connection error"):
-                return result
+            # An invalid key will not fix itself, so only retry recoverable errors
+            if not error.retryable:
+                break
             
-            # Retry with exponential backoff
+            # Retry with exponential backoff, or as long as the API asked us to wait
             if attempt < max_retries:
-                import time
-                time.sleep(2 ** attempt)
+                time.sleep(error.retry_after or 2 ** attempt)
         
-        return result
+        return error.message
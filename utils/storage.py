@@ -3,10 +3,34 @@ Local Storage Utilities for SmartResume AI
 Handles saving/loading resume data to browser session and JSON files
 """
 
+import copy
+import io
 import json
 import streamlit as st
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
+
+try:
+    # Faster JSON encoding and decoding when installed, stdlib json otherwise
+    import orjson
+except ImportError:
+    orjson = None
+
+# Maximum number of AI responses cached per session
+_LLM_CACHE_SIZE = 128
+
+
+def _by_name(entries: List[Dict]) -> Dict[str, Dict]:
+    """Key saved entries by name, a later entry replaces an earlier one with the same name"""
+    return {entry['name']: entry for entry in entries}
+
+
+def _index_by_resume(cover_letters: Dict[str, Dict]) -> Dict[str, Dict[str, None]]:
+    """Map each resume name to the names of its cover letters, in saved order"""
+    index = {}
+    for name, cover_letter in cover_letters.items():
+        index.setdefault(cover_letter.get('resume_name'), {})[name] = None
+    return index
 
 
 class LocalStorage:
@@ -15,9 +39,18 @@ class LocalStorage:
     def __init__(self):
         """Initialize local storage in session state"""
         if 'saved_resumes' not in st.session_state:
-            st.session_state['saved_resumes'] = []
+            st.session_state['saved_resumes'] = {}
         if 'saved_cover_letters' not in st.session_state:
-            st.session_state['saved_cover_letters'] = []
+            st.session_state['saved_cover_letters'] = {}
+        # Sessions started before the switch to dicts still hold lists
+        if isinstance(st.session_state['saved_resumes'], list):
+            st.session_state['saved_resumes'] = _by_name(st.session_state['saved_resumes'])
+        if isinstance(st.session_state['saved_cover_letters'], list):
+            st.session_state['saved_cover_letters'] = _by_name(st.session_state['saved_cover_letters'])
+        if 'cover_letters_by_resume' not in st.session_state:
+            st.session_state['cover_letters_by_resume'] = _index_by_resume(
+                st.session_state['saved_cover_letters']
+            )
     
     def save_resume(self, resume_name: str, resume_data: Dict) -> bool:
         """
@@ -31,28 +64,23 @@ class LocalStorage:
             bool: True if saved successfully
         """
         try:
-            # Check if resume with same name exists
-            existing_index = None
-            for i, resume in enumerate(st.session_state['saved_resumes']):
-                if resume['name'] == resume_name:
-                    existing_index = i
-                    break
+            resumes = st.session_state['saved_resumes']
+            existing = resumes.get(resume_name)
+            now = datetime.now().isoformat()
             
             resume_entry = {
                 'name': resume_name,
                 'target_role': resume_data.get('target_role', ''),
-                'data': resume_data,
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
+                # A snapshot, the lists inside resume_data are the live form state
+                'data': copy.deepcopy(resume_data),
+                'created_at': now,
+                'updated_at': now
             }
             
-            if existing_index is not None:
-                # Update existing resume
-                resume_entry['created_at'] = st.session_state['saved_resumes'][existing_index]['created_at']
-                st.session_state['saved_resumes'][existing_index] = resume_entry
-            else:
-                # Add new resume
-                st.session_state['saved_resumes'].append(resume_entry)
+            if existing is not None:
+                # Update existing resume, it keeps its place in the order
+                resume_entry['created_at'] = existing['created_at']
+            resumes[resume_name] = resume_entry
             
             return True
         except Exception as e:
@@ -61,7 +89,7 @@ class LocalStorage:
     
     def get_all_resumes(self) -> List[Dict]:
         """Get all saved resumes"""
-        return st.session_state.get('saved_resumes', [])
+        return list(st.session_state.get('saved_resumes', {}).values())
     
     def get_resume(self, resume_name: str) -> Optional[Dict]:
         """
@@ -73,10 +101,7 @@ class LocalStorage:
         Returns:
             Resume dictionary or None
         """
-        for resume in st.session_state.get('saved_resumes', []):
-            if resume['name'] == resume_name:
-                return resume
-        return None
+        return st.session_state.get('saved_resumes', {}).get(resume_name)
     
     def delete_resume(self, resume_name: str) -> bool:
         """
@@ -89,16 +114,12 @@ class LocalStorage:
             bool: True if deleted successfully
         """
         try:
-            st.session_state['saved_resumes'] = [
-                r for r in st.session_state.get('saved_resumes', [])
-                if r['name'] != resume_name
-            ]
+            st.session_state['saved_resumes'].pop(resume_name, None)
             
             # Also delete associated cover letters
-            st.session_state['saved_cover_letters'] = [
-                cl for cl in st.session_state.get('saved_cover_letters', [])
-                if cl.get('resume_name') != resume_name
-            ]
+            cover_letters = st.session_state['saved_cover_letters']
+            for name in st.session_state['cover_letters_by_resume'].pop(resume_name, ()):
+                cover_letters.pop(name, None)
             
             return True
         except Exception as e:
@@ -121,12 +142,10 @@ class LocalStorage:
             bool: True if saved successfully
         """
         try:
-            # Check if cover letter with same name exists
-            existing_index = None
-            for i, cl in enumerate(st.session_state['saved_cover_letters']):
-                if cl['name'] == cover_letter_name:
-                    existing_index = i
-                    break
+            cover_letters = st.session_state['saved_cover_letters']
+            by_resume = st.session_state['cover_letters_by_resume']
+            existing = cover_letters.get(cover_letter_name)
+            now = datetime.now().isoformat()
             
             cover_letter_entry = {
                 'name': cover_letter_name,
@@ -134,17 +153,19 @@ class LocalStorage:
                 'company': company,
                 'job_title': job_title,
                 'content': content,
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
+                'created_at': now,
+                'updated_at': now
             }
             
-            if existing_index is not None:
-                # Update existing
-                cover_letter_entry['created_at'] = st.session_state['saved_cover_letters'][existing_index]['created_at']
-                st.session_state['saved_cover_letters'][existing_index] = cover_letter_entry
+            if existing is not None:
+                # Update existing, it keeps its place in the order
+                cover_letter_entry['created_at'] = existing['created_at']
+            cover_letters[cover_letter_name] = cover_letter_entry
+            if existing is not None and existing.get('resume_name') != resume_name:
+                # Moved to another resume, rebuild so both lists stay in saved order
+                st.session_state['cover_letters_by_resume'] = _index_by_resume(cover_letters)
             else:
-                # Add new
-                st.session_state['saved_cover_letters'].append(cover_letter_entry)
+                by_resume.setdefault(resume_name, {})[cover_letter_name] = None
             
             return True
         except Exception as e:
@@ -153,10 +174,48 @@ class LocalStorage:
     
     def get_cover_letters_for_resume(self, resume_name: str) -> List[Dict]:
         """Get all cover letters for a specific resume"""
-        return [
-            cl for cl in st.session_state.get('saved_cover_letters', [])
-            if cl.get('resume_name') == resume_name
-        ]
+        cover_letters = st.session_state.get('saved_cover_letters', {})
+        names = st.session_state.get('cover_letters_by_resume', {}).get(resume_name, ())
+        return [cover_letters[name] for name in names]
+    
+    def count_cover_letters_for_resume(self, resume_name: str) -> int:
+        """Count the cover letters for a specific resume without building the list"""
+        return len(st.session_state.get('cover_letters_by_resume', {}).get(resume_name, ()))
+    
+    def get_llm_response(self, key: str) -> Optional[str]:
+        """
+        Get a cached AI response for this session
+        
+        Args:
+            key: Cache key of the request
+            
+        Returns:
+            Cached response text or None
+        """
+        return st.session_state.get('llm_cache', {}).get(key)
+    
+    def save_llm_response(self, key: str, content: str) -> None:
+        """
+        Cache an AI response for this session, keeping the most recent entries
+        
+        Args:
+            key: Cache key of the request
+            content: Generated text
+        """
+        cache = st.session_state.setdefault('llm_cache', {})
+        cache.pop(key, None)
+        cache[key] = content
+        if len(cache) > _LLM_CACHE_SIZE:
+            # Dicts keep insertion order, so the first key is the oldest
+            del cache[next(iter(cache))]
+    
+    def _export_payload(self) -> Dict:
+        """Build the backup document written by both export methods"""
+        return {
+            'resumes': list(st.session_state.get('saved_resumes', {}).values()),
+            'cover_letters': list(st.session_state.get('saved_cover_letters', {}).values()),
+            'export_date': datetime.now().isoformat()
+        }
     
     def export_all_data(self) -> str:
         """
@@ -165,30 +224,64 @@ class LocalStorage:
         Returns:
             JSON string of all data
         """
-        data = {
-            'resumes': st.session_state.get('saved_resumes', []),
-            'cover_letters': st.session_state.get('saved_cover_letters', []),
-            'export_date': datetime.now().isoformat()
-        }
+        data = self._export_payload()
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
         return json.dumps(data, indent=2)
     
-    def import_data(self, json_str: str) -> bool:
+    def export_all_data_bytes(self) -> bytes:
+        """
+        Export all saved data as UTF-8 encoded JSON
+        
+        Same content as export_all_data(), but the JSON is written chunk by
+        chunk into a byte buffer, so the full text never exists as a str
+        alongside its encoded copy.
+        
+        Returns:
+            JSON bytes of all data
+        """
+        data = self._export_payload()
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        text = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        json.dump(data, text, indent=2)
+        # detach() flushes the text layer and hands back the byte buffer
+        return text.detach().getvalue()
+    
+    def import_data(self, json_str: Union[str, bytes]) -> bool:
         """
         Import data from JSON string
         
         Args:
-            json_str: JSON string to import
+            json_str: JSON string to import, or its UTF-8 encoded bytes
             
         Returns:
             bool: True if imported successfully
         """
         try:
-            data = json.loads(json_str)
+            data = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
+        except Exception as e:
+            st.error(f"Error importing data: {str(e)}")
+            return False
+        return self.import_data_obj(data)
+    
+    def import_data_obj(self, data: Dict) -> bool:
+        """
+        Import already-parsed backup data
+        
+        Args:
+            data: Dictionary with 'resumes' and/or 'cover_letters' lists
             
+        Returns:
+            bool: True if imported successfully
+        """
+        try:
             if 'resumes' in data:
-                st.session_state['saved_resumes'] = data['resumes']
+                st.session_state['saved_resumes'] = _by_name(data['resumes'])
             if 'cover_letters' in data:
-                st.session_state['saved_cover_letters'] = data['cover_letters']
+                cover_letters = _by_name(data['cover_letters'])
+                st.session_state['saved_cover_letters'] = cover_letters
+                st.session_state['cover_letters_by_resume'] = _index_by_resume(cover_letters)
             
             return True
         except Exception as e:
@@ -198,9 +291,24 @@ class LocalStorage:
     def clear_all_data(self) -> bool:
         """Clear all saved data"""
         try:
-            st.session_state['saved_resumes'] = []
-            st.session_state['saved_cover_letters'] = []
+            st.session_state['saved_resumes'] = {}
+            st.session_state['saved_cover_letters'] = {}
+            st.session_state['cover_letters_by_resume'] = {}
             return True
         except Exception as e:
             st.error(f"Error clearing data: {str(e)}")
             return False
+
+
+def get_storage() -> LocalStorage:
+    """
+    Get the LocalStorage for the current session, creating it on first use
+    
+    Returns:
+        LocalStorage instance kept in session state across reruns
+    """
+    storage = st.session_state.get('_local_storage')
+    if storage is None:
+        storage = LocalStorage()
+        st.session_state['_local_storage'] = storage
+    return storage
@@ -4,6 +4,28 @@ Input validation functions for SmartResume AI
 
 import re
 
+try:
+    # RE2 matches in linear time, stdlib re is used when it is not installed
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+# Separators allowed in phone numbers, deleted before the digit check: every
+# Unicode whitespace character (all below U+3001, the same set as regex \s,
+# so pasted NBSP or thin spaces are accepted) plus -()
+_PHONE_SEPARATORS = str.maketrans('', '', ''.join(
+    ch for ch in map(chr, range(0x3001)) if ch.isspace()
+) + '-()')
+
+# Patterns compiled once at import, the validators run on every rerun
+_EMAIL_RE = _regex.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_URL_RE = _regex.compile(r'^https?://[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}.*$')
+_LINKEDIN_RE = _regex.compile(r'^https?://(www\.)?linkedin\.com/in/[a-zA-Z0-9-]+/?$')
+
+def _is_plain_decimal(value):
+    """Whether value is a string of ASCII digits with at most one decimal point"""
+    return isinstance(value, str) and value.isascii() and value.replace('.', '', 1).isdigit()
+
 def validate_email(email):
     """
     Validate email address format
@@ -16,8 +38,7 @@ def validate_email(email):
     """
     if not email:
         return False
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return _EMAIL_RE.match(email) is not None
 
 def validate_phone(phone):
     """
@@ -32,10 +53,11 @@ def validate_phone(phone):
     if not phone:
         return False
     # Remove common separators
-    cleaned = re.sub(r'[\s\-\(\)]', '', phone)
-    # Check if it contains only digits and + (for country code)
-    pattern = r'^\+?[0-9]{10,15}$'
-    return bool(re.match(pattern, cleaned))
+    cleaned = phone.translate(_PHONE_SEPARATORS)
+    # Allow a leading + for the country code, the rest must be 10-15 digits
+    if cleaned.startswith('+'):
+        cleaned = cleaned[1:]
+    return 10 <= len(cleaned) <= 15 and cleaned.isascii() and cleaned.isdigit()
 
 def validate_url(url):
     """
@@ -49,8 +71,7 @@ def validate_url(url):
     """
     if not url:
         return True  # URL is optional
-    pattern = r'^https?://[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}.*$'
-    return bool(re.match(pattern, url))
+    return _URL_RE.match(url) is not None
 
 def validate_linkedin(url):
     """
@@ -64,8 +85,7 @@ def validate_linkedin(url):
     """
     if not url:
         return True  # LinkedIn is optional
-    pattern = r'^https?://(www\.)?linkedin\.com/in/[a-zA-Z0-9-]+/?$'
-    return bool(re.match(pattern, url))
+    return _LINKEDIN_RE.match(url) is not None
 
 def validate_year(year):
     """
@@ -77,6 +97,10 @@ def validate_year(year):
     Returns:
         bool: True if valid, False otherwise
     """
+    if isinstance(year, int):
+        return 1950 <= year <= 2030
+    if isinstance(year, str) and year.isascii() and year.isdigit():
+        return 1950 <= int(year) <= 2030
     try:
         year_int = int(year)
         return 1950 <= year_int <= 2030
@@ -94,6 +118,10 @@ def validate_cgpa(cgpa, max_cgpa=10):
     Returns:
         bool: True if valid, False otherwise
     """
+    if isinstance(cgpa, (int, float)):
+        return 0 <= cgpa <= max_cgpa
+    if _is_plain_decimal(cgpa):
+        return 0 <= float(cgpa) <= max_cgpa
     try:
         cgpa_float = float(cgpa)
         return 0 <= cgpa_float <= max_cgpa
@@ -110,6 +138,10 @@ def validate_percentage(percentage):
     Returns:
         bool: True if valid, False otherwise
     """
+    if isinstance(percentage, (int, float)):
+        return 0 <= percentage <= 100
+    if _is_plain_decimal(percentage):
+        return 0 <= float(percentage) <= 100
     try:
         perc_float = float(percentage)
         return 0 <= perc_float <= 100
@@ -128,9 +160,8 @@ def sanitize_text(text):
     """
     if not text:
         return ""
-    # Remove extra whitespace
-    text = " ".join(text.split())
-    return text.strip()
+    # Collapse whitespace runs, split() already drops leading and trailing ones
+    return " ".join(text.split())
 
 def validate_required_field(value, field_name):
     """